@@ -1,5 +1,5 @@
 #__version__ = "0.1.4" #August 11th, 2025
-__version__ = "0.1.6" #Sept 30th, 2025
+#__version__ = "0.1.6" #Sept 30th, 2025
 __version__ = "0.1.7" #Feb 6th, 2026
 
 
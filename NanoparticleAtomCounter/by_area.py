@@ -16,6 +16,9 @@ calculate_areas(element: str, r: float, theta: float, facet: tuple) -> tuple
 
 calculate_by_area(element: str, r: float, theta: float, facet: tuple) -> tuple
     Main function to do all calculations through the 'area' method
+
+calculate_by_area_batch(elements, rs, thetas, interface_facets, surface_facets) -> tuple
+    calculate_by_area over whole input columns, returning int64 arrays
 """
 
 from typing import Tuple, List
@@ -29,6 +32,9 @@ from NanoparticleAtomCounter.count_utilities import (
     calculate_total_volume,
     calculate_surface_area,
     calculate_constants,
+    _trig_bundle,
+    _radians,
+    _batch_count,
 )
 
 
@@ -38,6 +44,8 @@ def calculate_areas(
     theta: float = None,
     interface_facet: Tuple[int, int, int] = None,
     surface_facet: Tuple[int, int, int] = None,
+    constants: Tuple[float, float, float] = None,
+    trig: Tuple[float, float, float, float] = None,
 ) -> Tuple[float, float, float]:
     """
     Calculate area of:
@@ -52,11 +60,22 @@ def calculate_areas(
         theta (float):              contact angle, in degrees
         interface_facet (Tuple[int,int,int]): facet facing the support
         surface_facet (Tuple[int,int,int]): facet facing vacuum
+        constants (Tuple[float,float,float]): output of calculate_constants;
+                                    pass it if already looked up, to skip
+                                    a second lookup
+        trig (Tuple):               output of _trig_bundle for this theta;
+                                    pass it if already evaluated, to skip
+                                    a second sin/cos
 
     Returns:
         interfacial area (float):       interface area. excludes perimeter
         perimeter area (float):         perimeter area.
         surface area (float):           NP outer surface area. excludes interface
+
+    footprint_radius and theta may be scalars or equal-length arrays;
+    on arrays every step below runs as a numpy ufunc over the whole
+    batch, so the closed-form arithmetic never re-enters the interpreter
+    per row
     """
     # r: footprint radius (i.e. radius of bottom of the interface),
     # inter_a: interfacial area (using the bottom of the interface).
@@ -67,13 +86,22 @@ def calculate_areas(
     # d: atomic diameter
     # z: interplanar spacing at the interface (height of the interface)
 
-    _, z, d = calculate_constants(element, facet=interface_facet)
+    if constants is None:
+        constants = calculate_constants(element, facet=interface_facet)
+    _, z, d = constants
 
     r = footprint_radius
     footprint_a = np.pi * (r**2)  # A^2
     interface_a = np.pi * ((r - d) ** 2)  # A^2
     peri_a = footprint_a - interface_a  # A^2
-    surf_a = calculate_surface_area(element, r, theta, interface_facet=interface_facet)
+    surf_a = calculate_surface_area(
+        element,
+        r,
+        theta,
+        interface_facet=interface_facet,
+        interplanar_spacing=z,
+        trig=trig,
+    )
 
     return interface_a, peri_a, surf_a  # all in A^2
 
@@ -97,28 +125,73 @@ def calculate_by_area(
 
     Returns:
         perimeter_atoms, interfacial_atoms, surface_atoms, all_atoms
+
+    footprint_radius and theta may be scalars or equal-length arrays
     """
+    # look the constants and the trig bundle up once here and thread them
+    # down, rather than once per downstream call
+    constants = calculate_constants(element, facet=interface_facet)
+    molar_volume = constants[0]
+    interface_density = calculate_atomic_density(
+        element, interface_facet, constants=constants
+    )
+    trig = _trig_bundle(_radians(theta))
+
     interfacial_area, perimeter_area, NP_surface_area = calculate_areas(
         element,
         footprint_radius,
         theta,
         interface_facet,
         surface_facet,
+        constants=constants,
+        trig=trig,
     )
 
-    perimeter_atoms, interfacial_atoms = [
-        area_to_atoms(area=i, element=element, facet=interface_facet)
-        for i in [
-            perimeter_area,
-            interfacial_area,
-        ]
-    ]
+    # perimeter and interface both convert at the interface-facet density,
+    # so stack them and share a single rint pass instead of two
+    # area_to_atoms calls; the surface stays a separate call because it
+    # converts at the surface-facet density
+    perimeter_atoms, interfacial_atoms = np.rint(
+        np.stack(np.broadcast_arrays(perimeter_area, interfacial_area))
+        * interface_density
+    ).astype(np.int64)
+    if np.ndim(footprint_radius) == 0:
+        perimeter_atoms, interfacial_atoms = (
+            int(perimeter_atoms),
+            int(interfacial_atoms),
+        )
 
     NP_surface_atoms = area_to_atoms(
         area=NP_surface_area, element=element, facet=surface_facet
     )
 
-    total_volume = calculate_total_volume(footprint_radius, theta)
-    total_atoms = volume_to_atoms(total_volume, element, None)
+    total_volume = calculate_total_volume(footprint_radius, theta, trig=trig)
+    total_atoms = volume_to_atoms(total_volume, element, molar_volume)
 
     return perimeter_atoms, interfacial_atoms, NP_surface_atoms, total_atoms
+
+
+def calculate_by_area_batch(
+    elements,
+    rs,
+    thetas,
+    interface_facets,
+    surface_facets,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    calculate_by_area over whole input columns at once
+
+    Requires:
+        elements:           (N,) array of atomic symbols
+        rs:                 (N,) array of footprint radii. Ang
+        thetas:             (N,) array of contact angles. degrees
+        interface_facets:   (N, 3) int array; NO_FACET marks "not given"
+        surface_facets:     (N, 3) int array; NO_FACET marks "not given"
+
+    Returns:
+        perimeter_atoms, interfacial_atoms, surface_atoms, all_atoms
+        each a (N,) int64 array
+    """
+    return _batch_count(
+        calculate_by_area, elements, rs, thetas, interface_facets, surface_facets
+    )
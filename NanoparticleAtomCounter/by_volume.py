@@ -14,6 +14,9 @@ calculate_volumes(element: str, r: float, theta: float, facet: tuple) -> tuple
 
 calculate_by_volume(element: str, r: float, theta: float, facet: tuple) -> tuple
     Main function to do all calculations through the 'volume' method
+
+calculate_by_volume_batch(elements, rs, thetas, interface_facets, surface_facets) -> tuple
+    calculate_by_volume over whole input columns, returning int64 arrays
 """
 
 from typing import Tuple, List
@@ -26,9 +29,13 @@ from NanoparticleAtomCounter.count_utilities import (
     calculate_total_volume,
     calculate_surface_area,
     calculate_constants,
+    _trig_bundle,
+    _radians,
+    _batch_count,
+    _warn_once,
+    _volume_to_atoms_fast,
 )
-
-# warnings.filterwarnings(action="ignore")
+from NanoparticleAtomCounter.data import N_A
 
 
 def calculate_volumes(
@@ -36,6 +43,8 @@ def calculate_volumes(
     footprint_radius: float,
     theta: float = None,
     interface_facet: Tuple[int, int, int] = None,
+    constants: Tuple[float, float, float] = None,
+    trig: Tuple[float, float, float, float] = None,
 ) -> Tuple[float, float, float]:
     """
     Calculate volume of the interfacial region (excluding the perimeter region),
@@ -46,9 +55,20 @@ def calculate_volumes(
         theta (float):              contact angle. degrees
         footprint_radius (float):   NP footprint radius. In Ang
         interface_facet (Tuple[int,int,int]): facet facing the support
+        constants (Tuple[float,float,float]): output of calculate_constants;
+                                    pass it if already looked up, to skip
+                                    a second lookup
+        trig (Tuple):               output of _trig_bundle for this theta;
+                                    pass it if already evaluated, to skip
+                                    a second sin/cos
 
     Returns:
         interface_volume, perimeter_volume, total_volume     all in A^3
+
+    footprint_radius and theta may be scalars or equal-length arrays;
+    on arrays every step below runs as a numpy ufunc over the whole
+    batch, so the closed-form arithmetic never re-enters the interpreter
+    per row
     """
     # R: radius from spherical cap center,
     # r: footprint radius (i.e. radius of bottom of spherical segment),
@@ -61,65 +81,121 @@ def calculate_volumes(
     # if θ==90: zero
     # z1: atomic diameter
     # z: interplanar spacing at the interface, i.e. this is the height of the interface
-    if theta in [0, 180]:
+    theta_arr = np.asarray(theta)
+    if np.any((theta_arr == 0) | (theta_arr == 180)):
         raise ValueError(f"Contact angle of {theta} not allowed")
-    elif theta > 180 or theta < 0:
+    elif np.any((theta_arr > 180) | (theta_arr < 0)):
         raise ValueError(f"Supplied {theta} is > 180 or < 0. Not allowed")
 
     r = footprint_radius  # to make things clear
-    if r <= 0:
+    if np.any(np.asarray(r) <= 0):
         raise ValueError(f"r ({r}) Ang supplied is <= 0. Invalid")
-    if r < 5:
-        warnings.warn(
+    if np.any(np.asarray(r) < 5):
+        _warn_once(
+            ("volumes_small_r", element),
             f"""Small value of r ({r}) Ang supplied; a spherical cap
         approximation may be tenuous""",
             category=UserWarning,
         )
 
-    _, z, z1 = calculate_constants(element=element, facet=interface_facet)
+    if constants is None:
+        constants = calculate_constants(element=element, facet=interface_facet)
+    _, z, z1 = constants
 
-    R = r / np.sin(np.radians(theta))
+    # one sin/cos evaluation serves R, alpha, and beta
+    sin_t, _, alpha_t, beta_t = trig if trig is not None else _trig_bundle(_radians(theta))
+
+    ##Find h, x^2, and x2^2
+    # both branches are evaluated on the full array and the right one selected
+    # per entry; the volume formulas only ever need x and x2 SQUARED, so we
+    # work with the squares directly and never take (or undo) a square root
+    #
+    # for large batches this kernel is memory-bound, so the ufuncs below
+    # write into preallocated buffers (out=) instead of each expression
+    # allocating its own temporary
+    obtuse = np.asarray(theta) > 90
+    r = np.asarray(r, dtype=float)
+    z_sq = z**2
+
+    r_sq = np.square(r, out=np.empty_like(r))
     # r2 = radial spacing
-    r2 = np.clip(
-        r - z1, 0, None
-    )  # no reliable formula for radial spacing. assumed to be = atomic diameter
+    # no reliable formula for radial spacing. assumed to be = atomic diameter
     # clip so it doesn't become negative for extremely small footprint radii
-    ##Find h and x
-    if theta > 90:
-        h = np.sqrt(R**2 - r**2) - z  # thus spake pythagoras
-        x = np.sqrt(R**2 - h**2)  # eqn 1
-        dome_height = h + z + R
-        x2 = np.sqrt(
-            (2 * h * z) + (z**2) + (r2**2)
-        )  # from eqn1, noting that R^2 = (h+z)^2 + r^2 and then substituting r2 for r
-    else:
-        h = np.clip(np.sqrt(R**2 - r**2), 0, None)  # clip so h==0 if theta == 90
-        dome_height = R + h
-        x = np.sqrt(R**2 - ((h + z) ** 2))  # eqn 2
-        x2 = np.sqrt(
-            (h**2) - ((h + z) ** 2) + (r2**2)
-        )  # can have invalid values; see below notes
+    r2_sq = np.subtract(r, z1, out=np.empty_like(r))
+    # one-sided clip: maximum is the raw ufunc, without np.clip's
+    # bound-dispatch wrapper on top
+    np.maximum(r2_sq, 0.0, out=r2_sq)
+    np.multiply(r2_sq, r2_sq, out=r2_sq)
+
+    # R^2 = (r / sin)^2, squared in place on the division's output
+    R_sq = np.divide(r, sin_t, out=np.empty_like(r))
+    np.multiply(R_sq, R_sq, out=R_sq)
 
+    h = np.subtract(R_sq, r_sq, out=np.empty_like(r))
+    np.sqrt(h, out=h)  # thus spake pythagoras; >= 0, so no clip needed
+
+    # eqn 1 (obtuse): x^2 = R^2 - (h - z)^2; eqn 2 (acute): x^2 = R^2 - (h + z)^2
+    # only the sign of z differs, so select it once and share one kernel
+    signed_z = np.where(obtuse, -z, z)
+    x_sq = np.add(h, signed_z, out=np.empty_like(r))
+    np.multiply(x_sq, x_sq, out=x_sq)
+    np.subtract(R_sq, x_sq, out=x_sq)
+
+    # expanding eqn 1 (via R^2 = (h+z)^2 + r^2, substituting r2 for r) and
+    # eqn 2 likewise, both collapse to x2^2 = -/+ (2 h z) - z^2 + r2^2,
+    # again differing only in the sign of z; can go negative, see below notes
+    x2_sq = np.multiply(h, signed_z, out=np.empty_like(r))
+    np.multiply(x2_sq, -2.0, out=x2_sq)
+    np.add(x2_sq, r2_sq, out=x2_sq)
+    np.subtract(x2_sq, z_sq, out=x2_sq)
+
+    # a negative x_sq means even the full segment is degenerate (imaginary
+    # top radius); keep it NaN, as sqrt would have made it, so the atom
+    # conversion downstream zeroes it out
+    np.copyto(x_sq, np.nan, where=x_sq < 0)
 
     # Formula from https://en.wikipedia.org/wiki/Spherical_segment
-    segment_volume = np.pi * z * ((3 * (r**2 + x**2)) + z**2) / 6
-    interface_volume = np.pi * z * ((3 * (r2**2 + x2**2)) + z**2) / 6
-    total_volume = calculate_total_volume(r, theta)
+    segment_volume = np.add(r_sq, x_sq, out=x_sq)  # x_sq not needed again
+    np.multiply(segment_volume, 3.0, out=segment_volume)
+    np.add(segment_volume, z_sq, out=segment_volume)
+    np.multiply(segment_volume, np.pi * z / 6.0, out=segment_volume)
 
-    # if x2 was negative, then it means for the given combination of r and theta, if you shave off z from r
-    # then too much will be shaved off from the top of the spherical segment that its radius (x2) becomes negative
+    interface_volume = np.add(r2_sq, x2_sq, out=r2_sq)
+    np.multiply(interface_volume, 3.0, out=interface_volume)
+    np.add(interface_volume, z_sq, out=interface_volume)
+    np.multiply(interface_volume, np.pi * z / 6.0, out=interface_volume)
+
+    # same formula as calculate_total_volume, reusing the trig bundle
+    total_volume = np.multiply(r_sq, r, out=r_sq)
+    np.multiply(total_volume, alpha_t * beta_t * (np.pi / 3.0), out=total_volume)
+
+    # if x2_sq was negative, then it means for the given combination of r and theta, if you shave off z from r
+    # then too much will be shaved off from the top of the spherical segment that its radius becomes imaginary
     # this implies that we can't have any non-perimeter atoms for such a system
     # for a given r, will be more likely for smaller theta
     # for a given theta, will be more likely for smaller r
-    if np.isnan(interface_volume):
+    no_inner = x2_sq < 0
+    n_degenerate = int(np.count_nonzero(no_inner))
+    if n_degenerate:
+        # one aggregated warning for the whole batch, not one per row;
+        # show only the first few offending rows, not whole-array reprs
+        shown = min(n_degenerate, 3)
+        examples = ", ".join(
+            f"(r = {r_bad:g}, θ = {theta_bad:g})"
+            for r_bad, theta_bad in zip(
+                np.atleast_1d(np.asarray(r)[no_inner])[:shown],
+                np.atleast_1d(np.asarray(theta)[no_inner])[:shown],
+            )
+        )
         warnings.warn(
-            f"""footprint radius ({r}) and-or θ ({theta}) too small.
+            f"""footprint radius and-or θ too small for {n_degenerate} entr(y/ies)
+        (e.g. {examples}).
         There is no non-perimeter for the given combination of r and θ""",
             category=RuntimeWarning,
         )
-        interface_volume = 0
+        np.copyto(interface_volume, 0.0, where=no_inner)
 
-    perimeter_volume = segment_volume - interface_volume
+    perimeter_volume = np.subtract(segment_volume, interface_volume, out=segment_volume)
 
     return interface_volume, perimeter_volume, total_volume
 
@@ -145,29 +221,52 @@ def calculate_by_volume(
 
     Returns:
         perimeter_atoms, interfacial_atoms, surface_atoms, all_atoms
+
+    footprint_radius and theta may be scalars or equal-length arrays
     """
+    # look the constants up once here and thread them down, rather than
+    # once per downstream call; under the batch layer this runs once per
+    # (element, facet) group, so per-row specialization has nothing left
+    # to save
+    constants = calculate_constants(element=element, facet=interface_facet)
+    molar_volume, z, _ = constants
+    # likewise one trig bundle for the whole pipeline: calculate_volumes
+    # and calculate_surface_area share it instead of each re-evaluating
+    # sin/cos of the same theta
+    trig = _trig_bundle(_radians(theta))
 
     interfacial_volume, perimeter_volume, total_volume = calculate_volumes(
         element=element,
         footprint_radius=footprint_radius,
         theta=theta,
         interface_facet=interface_facet,
+        constants=constants,
+        trig=trig,
     )
 
-    interfacial_atoms, perimeter_atoms, total_atoms = [
-        volume_to_atoms(
-            volume=i,
-            element=element,
-            molar_volume=None,
+    # all three regions share one bulk density, so stack them and convert
+    # with a single rint pass instead of three volume_to_atoms calls
+    bulk_density = N_A / molar_volume  # atom/A^3
+    interfacial_atoms, perimeter_atoms, total_atoms = _volume_to_atoms_fast(
+        np.stack(
+            np.broadcast_arrays(interfacial_volume, perimeter_volume, total_volume)
+        ),
+        bulk_density,
+    )
+    if np.ndim(footprint_radius) == 0:
+        interfacial_atoms, perimeter_atoms, total_atoms = (
+            int(interfacial_atoms),
+            int(perimeter_atoms),
+            int(total_atoms),
         )
-        for i in [interfacial_volume, perimeter_volume, total_volume]
-    ]
 
     surface_area = calculate_surface_area(
         element=element,
         footprint_radius=footprint_radius,
         theta=theta,
         interface_facet=interface_facet,
+        interplanar_spacing=z,
+        trig=trig,
     )
 
     surface_atoms = area_to_atoms(
@@ -175,3 +274,29 @@ def calculate_by_volume(
     )
 
     return perimeter_atoms, interfacial_atoms, surface_atoms, total_atoms
+
+
+def calculate_by_volume_batch(
+    elements,
+    rs,
+    thetas,
+    interface_facets,
+    surface_facets,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    calculate_by_volume over whole input columns at once
+
+    Requires:
+        elements:           (N,) array of atomic symbols
+        rs:                 (N,) array of footprint radii. Ang
+        thetas:             (N,) array of contact angles. degrees
+        interface_facets:   (N, 3) int array; NO_FACET marks "not given"
+        surface_facets:     (N, 3) int array; NO_FACET marks "not given"
+
+    Returns:
+        perimeter_atoms, interfacial_atoms, surface_atoms, all_atoms
+        each a (N,) int64 array
+    """
+    return _batch_count(
+        calculate_by_volume, elements, rs, thetas, interface_facets, surface_facets
+    )
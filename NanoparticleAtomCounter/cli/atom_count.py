@@ -9,17 +9,25 @@ main:
     run all calculations
 """
 
-import ast
 from typing import Tuple, List, Literal
 from sys import argv, exit
 import numpy as np
 import warnings
-from NanoparticleAtomCounter.by_volume import calculate_by_volume
-from NanoparticleAtomCounter.by_area import calculate_by_area
+from NanoparticleAtomCounter.by_volume import calculate_by_volume_batch
+from NanoparticleAtomCounter.by_area import calculate_by_area_batch
+from NanoparticleAtomCounter.count_utilities import NO_FACET
 import pandas as pd
 from numpy.typing import NDArray
+
+try:
+    import pyarrow as pa
+    from pyarrow import csv as pa_csv
+    from pyarrow import parquet as pa_parquet
+except ImportError:  # pyarrow ships with streamlit but is not strictly required
+    pa = None
 from os import path
-from collections import Counter
+import csv
+import zipfile
 import argparse
 from time import perf_counter
 
@@ -27,16 +35,64 @@ from time import perf_counter
 MODE = "volume"
 OUTPUT = "output_atomcounts.csv"
 
+# both batch functions take whole input arrays and group rows by their
+# cache keys internally, so the dispatch table is all that's mode-specific
+BATCH_DISPATCH = {
+    "volume": calculate_by_volume_batch,
+    "area": calculate_by_area_batch,
+}
 
-def parse_input_data(
-    input_file: str,
-) -> Tuple[NDArray, NDArray, NDArray, NDArray, NDArray, NDArray]:
+
+def read_input_data(input_file: str) -> pd.DataFrame:
     """
-    Reads the input csv or xlxs
+    Reads the input csv or xlxs into a DataFrame
 
     Expected format of the file:
         FIRST ROW ->        r (A),R (A),Theta,Element,Facet
         FOLLOWING ROWS:     a,b,c,d,[x,y,z]
+    """
+    # declare the numeric columns up front so the parser converts them
+    # while tokenizing, skipping the whole-column dtype inference pass;
+    # keys that a (malformed) file lacks are simply ignored
+    dtypes = {"r (A)": np.float64, "R (A)": np.float64, "Theta": np.float64}
+    ext = path.splitext(input_file)[1].lower()
+    if ext in (".csv",):
+        try:
+            # pyarrow parses columns natively (multithreaded, no
+            # per-cell Python work), via pandas' engine wrapper so the
+            # rest of the pipeline still sees a DataFrame
+            df = pd.read_csv(input_file, delimiter=",", engine="pyarrow", dtype=dtypes)
+        except ImportError:  # pyarrow not installed; fall back to the C parser
+            df = pd.read_csv(input_file, delimiter=",", dtype=dtypes)
+    elif ext in (".xls", ".xlsx"):
+        if ext == ".xlsx" and not zipfile.is_zipfile(input_file):
+            raise ValueError(
+                f"""
+                '{input_file}' has an .xlsx extension but is not an
+                Excel container. Is it really an .xlsx file?
+                """
+            )
+        # reading the first sheet directly skips ExcelFile's full
+        # workbook probe followed by a second traversal of the cells;
+        # pandas opens the workbook via openpyxl in read_only/data_only
+        # mode, so the full workbook DOM is never materialized
+        df = pd.read_excel(input_file, sheet_name=0)
+    else:
+        raise ValueError(
+            f"""
+        Unrecognized file type: {ext}!
+                Requires .csv, .xls, or .xlsx
+                """
+        )  # first: pip install xlrd openpyxl
+
+    return df
+
+
+def parse_input_data(
+    input_file: str,
+) -> Tuple[NDArray, NDArray, NDArray, NDArray, NDArray, NDArray]:
+    """
+    Reads the input csv or xlxs and extracts its columns
 
     r:          Footprint (or contact) radius in Angstrom, e.g. 9.1
     R:          Radius of curvature in Angstrom, e.g. 17.12
@@ -55,31 +111,13 @@ def parse_input_data(
         if not provided, will assume defaults;
         see count_utilities.calculate_constants for the defaults
     """
+    return _extract_columns(read_input_data(input_file))
 
-    ext = path.splitext(input_file)[1].lower()
-    if ext in (".csv",):
-        df = pd.read_csv(input_file, delimiter=",")
-    elif ext in (".xls", ".xlsx"):
-        with pd.ExcelFile(input_file) as xls:
-            if not xls.sheet_names:
-                raise ValueError(
-                    f"""
-                    '{input_file}' looks like an Excel container but
-                    has no worksheets. Is it really an .xlsx file?
-                    """
-                )
-            df = xls.parse(
-                sheet_name=xls.sheet_names[0]
-            )  # assuming the data is in the first sheet
-    #        df = pd.read_excel(input_file, sheet_name = 0) #assuming the data is in the first sheet
-    else:
-        raise ValueError(
-            f"""
-        Unrecognized file type: {ext}!
-                Requires .csv, .xls, or .xlsx
-                """
-        )  # first: pip install xlrd openpyxl
 
+def _extract_columns(
+    df: pd.DataFrame,
+) -> Tuple[NDArray, NDArray, NDArray, NDArray, NDArray, NDArray]:
+    """Validate the input columns and pull them out as arrays"""
     # verify that the cols are labelled properly so we get the correct data
     df.columns = (
         df.columns.str.strip()
@@ -92,32 +130,125 @@ def parse_input_data(
         "Interface Facet",
         "Surface Facet",
     ]
-    # compare as multisets to check both presence *and* counts
-    assert Counter(df.columns) == Counter(expected), (
+    # set + length check both presence *and* counts (the expected names
+    # are unique, so this equals the multiset comparison)
+    columns = df.columns.tolist()
+    assert set(columns) == set(expected) and len(columns) == len(expected), (
         f"Column mismatch:\n"
-        f"  found    = {df.columns.tolist()}\n"
+        f"  found    = {columns}\n"
         f"  expected = {expected}"
     )
 
     rs = df["r (A)"].to_numpy()  # np.nan if no values
     Rs = df["R (A)"].to_numpy()  # np.nan if no values
     thetas = df["Theta"].to_numpy()
-    elements = df["Element"].to_numpy()
-    interface_facets = (
-        df["Interface Facet"]
-        .apply(lambda x: ast.literal_eval(x) if pd.notnull(x) else [None] * 3)
-        .to_numpy()
-    )  # None if no values
-    surface_facets = (
-        df["Surface Facet"]
-        .apply(lambda x: ast.literal_eval(x) if pd.notnull(x) else [None] * 3)
-        .to_numpy()
-    )  # None if no values
+    # canonicalize symbols once here, instead of per call downstream
+    elements = df["Element"].str.strip().str.capitalize().to_numpy()
+    interface_facets = _parse_facet_column(df["Interface Facet"])  # None if no values
+    surface_facets = _parse_facet_column(df["Surface Facet"])  # None if no values
 
     return rs, Rs, thetas, elements, interface_facets, surface_facets
 
 
-def main() -> None:
+def _parse_facet_column(column: pd.Series) -> NDArray:
+    """
+    Turn a column of facet strings like '(1, 1, 1)' or '[1, 1, 1]' into
+    a contiguous (N, 3) int32 array, with NO_FACET marking empty cells
+
+    One vectorized regex pass over the column, rather than
+    building a full AST per cell with ast.literal_eval; a flat integer
+    array also avoids carrying per-row Python tuples in an object array
+    """
+    return (
+        column.astype("string")
+        .str.extract(r"(-?\d+)\D+(-?\d+)\D+(-?\d+)")
+        .astype("float64")
+        .fillna(NO_FACET)
+        .to_numpy(dtype=np.int32)
+    )
+
+
+def count_dataframe(
+    df: pd.DataFrame, mode: Literal["volume", "area"] = MODE
+) -> pd.DataFrame:
+    """
+    Count atoms for every row of an already-loaded input DataFrame
+
+    Same pipeline as the CLI, minus any file I/O: callers that hold the
+    input in memory (e.g. the streamlit app) get the results back as a
+    DataFrame with Perimeter / Interface / Surface / Total columns,
+    without a disk round-trip
+
+    Requires:
+        df (pd.DataFrame):  input table with the documented columns
+        mode (Literal["volume", "area"]): counting method
+    """
+    rs, Rs, thetas, elements, interface_facets, surface_facets = _extract_columns(df)
+
+    # fill each missing (or zero) r from that row's R, so users can
+    # mix-and-match r and R row by row
+    missing = np.isnan(rs) | (rs == 0)
+    if np.any(missing):
+        print("converting R into r...")
+        # evaluate the trig only on the rows that actually need filling
+        rs = rs.astype(np.float64, copy=True)
+        rs[missing] = Rs[missing] * np.sin(np.radians(thetas[missing]))
+    if np.any(np.isnan(rs)):  # neither r nor R given for some row; exit
+        raise ValueError(f"Some entries for r (A) are missing!")
+    # a blank Theta cell would otherwise flow through as NaN and cast
+    # to garbage int64 counts in the output; fail loudly instead
+    if np.any(np.isnan(thetas)):
+        raise ValueError(f"Some entries for Theta are missing!")
+
+    # in case some variables have more entries than others
+    data = {
+        "rs": rs,
+        "Rs": Rs,
+        "thetas": thetas,
+        "elements": elements,
+        "interface_facets": interface_facets,
+        "surface_facets": surface_facets,
+    }
+
+    lengths = {name: len(arr) for name, arr in data.items()}
+    unique_lengths = set(lengths.values())
+
+    if len(unique_lengths) > 1:
+        warnings.warn(
+            f"Inconsistent data lengths: {lengths}. "
+            f"Truncating all to the shortest ({min(unique_lengths)})",
+            category=UserWarning,
+        )
+
+    min_len = min(unique_lengths)  # truncate everything to the same (minimum) length
+    for name in data:
+        data[name] = data[name][:min_len]
+
+    # rows are independent, but the batch functions already compute them in
+    # grouped vectorized numpy calls (SIMD within each ufunc); fanning rows
+    # out over worker processes or threads instead would pay pickling and
+    # startup for a kernel that is memory-bound, for no extra throughput
+    peri_atoms, inter_atoms, surf_atoms, tot_atoms = BATCH_DISPATCH[mode](
+        elements=data["elements"],
+        rs=data["rs"],
+        thetas=data["thetas"],
+        interface_facets=data["interface_facets"],
+        surface_facets=data["surface_facets"],
+    )
+
+    # the four columns arrive as preallocated int64 arrays from the batch
+    # layer, so the frame is built without any Python-object transpose
+    return pd.DataFrame(
+        {
+            "Perimeter": peri_atoms,
+            "Interface": inter_atoms,
+            "Surface": surf_atoms,
+            "Total": tot_atoms,
+        }
+    )
+
+
+def main(argv: List[str] = None) -> None:
     f"""
     Main function to do all calculations through the selected method
 
@@ -125,7 +256,8 @@ def main() -> None:
         input_file (str):                   input file name, with full path
         output_file (str):                   output file name, with full path. default = 'output.txt'
         mode (Literal["volume", "area"])    whether to calculate by volume or area. Default = 'volume'
-
+        argv (List[str]):                   arguments; defaults to sys.argv, but in-process
+                                            callers (e.g. the streamlit app) can pass their own
 
     Returns:
         NONE, but writes out the output file
@@ -163,81 +295,49 @@ def main() -> None:
         choices=("volume", "area"),
     )
 
+    parser.add_argument(
+        "--format",
+        "-f",
+        type=str,
+        default="csv",
+        help="""Output format. parquet round-trips much faster than csv
+            when the output is read back programmatically (e.g. by the
+            web app). default = 'csv' """,
+        choices=("csv", "parquet"),
+    )
+
     start = perf_counter()
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
     input_file = args.input
     output_file = args.output
     mode = args.mode.lower()
 
-    rs, Rs, thetas, elements, interface_facets, surface_facets = parse_input_data(
-        input_file
-    )
-
-    if np.all(np.isnan(rs)) or np.all(
-        rs == 0
-    ):  # if rs is empty or 0, convert Rs into rs
-        print("converting r into R...")
-        rs = Rs * np.sin(np.radians(thetas))
-    elif np.any(np.isnan(rs)):  # if there is any rs value missing, exit
-        raise ValueError(f"Some entries for r (A) are missing!")
-
-    # in case some variables have more entries than others
-    data = {
-        "rs": rs,
-        "Rs": Rs,
-        "thetas": thetas,
-        "elements": elements,
-        "interface_facets": interface_facets,
-        "surface_facets": surface_facets,
-    }
-
-    lengths = {name: len(arr) for name, arr in data.items()}
-    unique_lengths = set(lengths.values())
-
-    if len(unique_lengths) > 1:
-        warnings.warn(
-            f"Inconsistent data lengths: {lengths}. "
-            f"Truncating all to the shortest ({min(unique_lengths)})",
-            category=UserWarning,
-        )
-
-    min_len = min(unique_lengths)  # truncate everything to the same (minimum) length
-    for name in data:
-        data[name] = data[name][:min_len]
-
-    mode_ = {
-        "volume": calculate_by_volume,
-        "area": calculate_by_area,
-    }
-
-    peri_atoms, inter_atoms, surf_atoms, tot_atoms = zip(
-        *[
-            mode_[mode](
-                element=data["elements"][i],
-                footprint_radius=data["rs"][i],
-                theta=data["thetas"][i],
-                interface_facet=tuple(data["interface_facets"][i]),
-                surface_facet=tuple(data["surface_facets"][i]),
-                # to be able to cache in calculate_constants(), facets must be immutable (i.e. tuple rather than list)
-                # just in case the user had given as [x, y, z] rather than (x, y, z)
-                # so, I am converting to a tuple
-            )
-            for i in range(min_len)
-        ]
-    )
+    results = count_dataframe(read_input_data(input_file), mode=mode)
 
     print("Success!")
 
-    df = pd.DataFrame(
-        {
-            "Perimeter": peri_atoms,
-            "Interface": inter_atoms,
-            "Surface": surf_atoms,
-            "Total": tot_atoms,
-        }
-    )
-
-    df.to_csv(output_file, index=False)
+    if args.format == "parquet":
+        if pa is not None:
+            pa_parquet.write_table(pa.Table.from_pandas(results, preserve_index=False), output_file)
+        else:
+            results.to_parquet(output_file, index=False)
+    elif pa is not None:
+        # arrow formats the int64 columns in C++, well faster than
+        # pandas' row-by-row to_csv
+        pa_csv.write_csv(
+            pa.Table.from_pandas(results, preserve_index=False),
+            output_file,
+            # match pandas' unquoted output
+            pa_csv.WriteOptions(quoting_style="none", quoting_header="none"),
+        )
+    else:
+        # no pyarrow: stream the int columns through csv.writer with a
+        # 1 MiB buffer instead of paying DataFrame.to_csv's per-cell
+        # formatting machinery (same bytes; \n terminator matches to_csv)
+        with open(output_file, "w", newline="", buffering=1 << 20) as f:
+            writer = csv.writer(f, lineterminator="\n")
+            writer.writerow(results.columns.tolist())
+            writer.writerows(results.to_numpy().tolist())
     print(f"Output ({output_file}) written!")
     timing = perf_counter() - start
     print(f"Calculation took {timing} seconds")
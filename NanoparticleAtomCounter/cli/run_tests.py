@@ -3,6 +3,7 @@ Automatically test all functions
 """
 
 from pathlib import Path
+from os import environ
 import sys
 from ascii_colors import ASCIIColors
 import pytest
@@ -14,7 +15,24 @@ def main() -> None:
     """
     repo_root = Path(__file__).resolve().parents[2]
     tests_dir = repo_root / "atomcounter_tests"
-    exit_code = pytest.main(["-s", str(tests_dir)])
+    # -n auto (pytest-xdist) spreads the independent tests over all cores;
+    # loadfile keeps each module's nodes on one worker, so the shared
+    # session fixtures compute once per worker instead of once per node
+    # spread. each worker is a separate OS process, so one module's
+    # imports or memory use cannot skew another's timing — the same
+    # isolation as re-execing pytest per file, without paying a fresh
+    # interpreter + collection pass per module
+    args = ["-n", "auto", "--dist", "loadfile", "-q", str(tests_dir)]
+    # the cache plugin only buys --lf/--ff reruns, which this one-shot
+    # wrapper never does, so skip its .pytest_cache writes by default;
+    # set NPAC_PYTEST_CACHE=1 to get the cache back when iterating locally.
+    # (no need to pre-compile the test files either: pytest's assertion
+    # rewriter keeps its own mtime-validated .pyc cache in __pycache__ —
+    # with a pytest-specific tag, so compileall output would be ignored —
+    # and later runs already skip re-parsing unchanged tests)
+    if environ.get("NPAC_PYTEST_CACHE") != "1":
+        args[-1:-1] = ["-p", "no:cacheprovider"]
+    exit_code = pytest.main(args)
     text = "All tests passed!" if exit_code == 0 else "Some tests failed!"
     color = ASCIIColors.color_green if exit_code == 0 else ASCIIColors.color_red
     ASCIIColors.print(
@@ -25,9 +25,10 @@ beta:
 
 from typing import Tuple, List
 from sys import argv, exit
+from functools import lru_cache
+import math
 import numpy as np
 import warnings
-from functools import lru_cache
 from NanoparticleAtomCounter.data import (
     chemical_symbols,
     atomic_numbers,
@@ -42,6 +43,9 @@ from NanoparticleAtomCounter.data import (
 ##extracts molar volume, interplanar spacing, and diameter of the nanoparticle element
 
 # this is the default for interfacial and surface (i.e. gas-oriented) facets
+# the string values here (and the string keys of data.interplanar_dist) are
+# parsed into tuples exactly once, at import, by _build_constants_table;
+# nothing on the per-call path formats or parses facet strings
 DEFAULT_FACETS = {
     "fcc": "(1, 1, 1)",
     "bcc": "(1, 1, 0)",
@@ -53,11 +57,76 @@ DEFAULT_FACETS = {
 }  # confirmed these to generally be the lowest-energy facets
 # (https://next-gen.materialsproject.org/materials and http://crystalium.materialsvirtuallab.org/)
 
+# sentinel for "facet not provided" in (N, 3) facet arrays; int32 min is
+# outside any plausible Miller index, so negative indices like (-1, 1, 1)
+# can never be mistaken for "missing" (-1 could be)
+NO_FACET = np.iinfo(np.int32).min
+
+_WARNED_KEYS = set()  # warning conditions already issued; see _warn_once
+
+
+def _warn_once(key: tuple, message: str, category=UserWarning) -> None:
+    """
+    Issue each distinct warning condition only once per process
+
+    warnings.warn walks the call stack and the filter chain every time,
+    which adds up when a batch hits the same condition in every row
+    """
+    if key in _WARNED_KEYS:
+        return
+    _WARNED_KEYS.add(key)
+    warnings.warn(message, category=category, stacklevel=3)
+
 
-# warnings.filterwarnings("ignore")
+
+def _parse_facet_string(facet_string: str) -> Tuple[int, int, int]:
+    """'(1, 1, 1)' (data-table key format) -> (1, 1, 1); import-time only"""
+    return tuple(int(i) for i in facet_string.strip("()").split(","))
+
+
+def _build_constants_table() -> Tuple[dict, dict]:
+    """
+    Precompute, once at import, the (molar volume, interplanar spacing,
+    covalent diameter) triple for every supported (element, facet) pair,
+    plus the default facet per element (resolved via DEFAULT_FACETS)
+    so calculate_constants is a single dict lookup rather than
+    string formatting + several dict hops per call
+    """
+    constants = {}
+    default_facets = {}
+    for element, facet_spacings in interplanar_dist.items():
+        molar_volume = molar_volumes.get(element)
+        if molar_volume is None:
+            continue
+        atomic_number = atomic_numbers[element]
+        diameter = 2 * covalent_radii[atomic_number]
+        for facet_string, spacing in facet_spacings.items():
+            facet = _parse_facet_string(facet_string)
+            constants[(element, facet)] = (molar_volume, spacing, diameter)
+        try:
+            crystal_lattice = reference_states[atomic_number]["symmetry"]
+            default_string = DEFAULT_FACETS[crystal_lattice]
+        except (KeyError, TypeError):  # no reference state or unsupported lattice
+            continue
+        default_facet = _parse_facet_string(default_string)
+        if (element, default_facet) in constants:
+            default_facets[element] = default_facet
+            constants[(element, None)] = constants[(element, default_facet)]
+
+    return constants, default_facets
+
+
+_CONSTANTS, _DEFAULT_FACET_BY_ELEMENT = _build_constants_table()
+
+# every atom count reduces to area * (z N_A / Vm) or volume * (N_A / Vm),
+# and both densities derive from the static tables above, so fold the
+# divisions into a precomputed (area_density, volume_density) table too
+_DENSITIES = {
+    key: (spacing * N_A / molar_vol, N_A / molar_vol)
+    for key, (molar_vol, spacing, _) in _CONSTANTS.items()
+}
 
 
-@lru_cache(maxsize=10_000)
 def calculate_constants(element: str, facet: Tuple[int, int, int] = None) -> float:
     """
     Extract molar volume (assumed at equilibrium),
@@ -76,67 +145,98 @@ def calculate_constants(element: str, facet: Tuple[int, int, int] = None) -> flo
     Exceptions:
         ValueError if crystal system of the nanoparticle's element is not supported
     """
-    ##in case facet is given as (x,y,z) rather than (x, y, z) as expected in data.py
-    h, k, l = facet if facet else [None] * 3
-    facet = f"({h}, {k}, {l})"
-    #    print(facet, element)
+    ##in case facet is given as (None, None, None) rather than None
+    h, k, l = facet if facet else (None, None, None)
+    facet = None if h is None else (h, k, l)
 
-    if facet == "(0, 0, 0)":
+    if facet == (0, 0, 0):
         raise ValueError(f"Facet cannot be {facet}")
 
     element = element.capitalize()
 
+    # if facet not given, pick default; warn once per element, not once
+    # per row of a CSV
+    if facet is None and element in _DEFAULT_FACET_BY_ELEMENT:
+        _warn_once(
+            ("default_facet", element),
+            f"Interfacial and-or Surface facet not given, "
+            f"will assume {_DEFAULT_FACET_BY_ELEMENT[element]}",
+            category=UserWarning,
+        )
+
     try:
-        atomic_number = atomic_numbers[element]
-        # if facet not given, pick default
-        if h is None:
-            reference_state = reference_states[atomic_number]
-            crystal_lattice = reference_state["symmetry"]
-            facet = DEFAULT_FACETS[crystal_lattice]
-            warnings.warn(
-                f"Interfacial and-or Surface facet not given, will assume {facet}",
-                category=UserWarning,
-            )
-        covalent_radius = covalent_radii[atomic_number]
-        molar_volume = molar_volumes[element]
-        interplanar_distance = interplanar_dist[element][facet]
+        return _CONSTANTS[(element, facet)]
     except KeyError:
         raise KeyError(f"Element type {element} not supported!")
-    except Exception as unknown_:
-        print(f"Unexpected error occured:\t{unknown_}")
 
-    return molar_volume, interplanar_distance, 2 * covalent_radius
+
+def _trig_bundle(theta_rad: float) -> Tuple[float, float, float, float]:
+    """
+    Evaluate sin and cos once and derive both spherical cap constants
+    from them, for theta already in radians
+
+    Returns:
+        sin(theta), cos(theta), alpha(theta), beta(theta)
+
+    Accepts a scalar or an array of angles; does no validation,
+    so validate theta before calling
+    """
+    # beta = (2 + cos)(1 - cos)/sin; with (1 - cos) = sin^2/(1 + cos)
+    # this becomes (2 + cos) * sin * alpha, which reuses alpha and trades
+    # the second division for a multiplication
+    if isinstance(theta_rad, np.ndarray):
+        sin_t = np.sin(theta_rad)
+        cos_t = np.cos(theta_rad)
+        alpha_t = 1 / (1 + cos_t)
+        beta_t = (2 + cos_t) * sin_t * alpha_t
+    else:
+        # math.sin/cos call libm directly, skipping the 0-d array boxing
+        # and ufunc dispatch numpy pays on Python scalars
+        sin_t = math.sin(theta_rad)
+        cos_t = math.cos(theta_rad)
+        # numpy would return inf at the poles; do the same instead of raising
+        alpha_t = 1 / (1 + cos_t) if cos_t != -1.0 else np.inf
+        beta_t = (2 + cos_t) * (1 - cos_t) / sin_t if sin_t != 0.0 else np.inf
+
+    return sin_t, cos_t, alpha_t, beta_t
+
+
+def _radians(theta: float) -> float:
+    """Degrees to radians without ufunc dispatch for scalar theta"""
+    if isinstance(theta, np.ndarray):
+        return np.radians(theta)
+
+    return math.radians(theta)
 
 
 def alpha(theta: int) -> float:
     """
     Constant needed for the spherical cap model equations.
     theta is in degrees
+    Accepts a scalar or an array of angles
     """
-    if theta < 0 or theta > 180:
+    if np.any((np.asarray(theta) < 0) | (np.asarray(theta) > 180)):
         warnings.warn(
             f"Invalid value of theta ({theta}) supplied", category=RuntimeWarning
         )
 
-    return 1 / (1 + np.cos(np.radians(theta)))
+    return _trig_bundle(_radians(theta))[2]
 
 
 def beta(theta: int) -> float:
     """
     Constant needed for the spherical cap model equations.
     theta is in degrees
+    Accepts a scalar or an array of angles
     Will give infinity if theta = 0 or 180
     """
-    if theta < 0 or theta > 180:
+    theta_arr = np.asarray(theta)
+    if np.any((theta_arr < 0) | (theta_arr > 180)):
         raise ValueError(f"Invalid value of theta ({theta}) supplied")
-    if theta in [0, 180]:
+    if np.any((theta_arr == 0) | (theta_arr == 180)):
         raise ValueError(f"Contact angle of {theta} not allowed")
 
-    return (
-        (2 + np.cos(np.radians(theta)))
-        * (1 - np.cos(np.radians(theta)))
-        / (np.sin(np.radians(theta)))
-    )
+    return _trig_bundle(_radians(theta))[3]
 
 
 def calculate_surface_area(
@@ -144,6 +244,8 @@ def calculate_surface_area(
     footprint_radius: float,
     theta: float = None,
     interface_facet: Tuple[int, int, int] = None,
+    interplanar_spacing: float = None,
+    trig: Tuple[float, float, float, float] = None,
 ) -> float:
     """
     Calculate area of outer surface of NP
@@ -153,34 +255,46 @@ def calculate_surface_area(
         element (str):              atomic symbol for atom type in the nanoparticle
         interface_facet (Tuple[int,int,int]): facet facing support
         theta (float):              contact angle. degrees
+        interplanar_spacing (float): interfacial interplanar spacing in A;
+                                    pass it if already looked up via
+                                    calculate_constants, to skip a second lookup
+        trig (Tuple):               output of _trig_bundle for this theta;
+                                    pass it if already evaluated, to skip
+                                    a second sin/cos
 
     Returns:
         surface area (float) in A^2
+
+    footprint_radius and theta may be scalars or equal-length arrays
     """
-    if theta in [0, 180]:
+    theta_arr = np.asarray(theta)
+    if np.any((theta_arr == 0) | (theta_arr == 180)):
         raise ValueError(f"Contact angle of {theta} not allowed")
-    elif theta > 180 or theta < 0:
+    elif np.any((theta_arr > 180) | (theta_arr < 0)):
         raise ValueError(f"Supplied {theta} is > 180 or < 0. Not allowed")
 
     r = footprint_radius  # to make things clear
-    if r <= 0:
+    if np.any(np.asarray(r) <= 0):
         raise ValueError(f"r ({r}) Ang supplied is <= 0. Invalid")
-    if r < 5:
-        warnings.warn(
+    if np.any(np.asarray(r) < 5):
+        _warn_once(
+            ("surface_area_small_r", element),
             f"""Small value of r ({r}) Ang supplied; a spherical cap
         approximation may be tenuous""",
             category=UserWarning,
         )
 
-    _, interplanar_spacing, _ = calculate_constants(
-        element=element, facet=interface_facet
-    )
+    if interplanar_spacing is None:
+        _, interplanar_spacing, _ = calculate_constants(
+            element=element, facet=interface_facet
+        )
     z = interplanar_spacing  # to make things clear
 
-    theta_rad = np.radians(theta)
+    # one sin/cos evaluation serves both terms of arg
+    sin_t, cos_t, *_ = trig if trig is not None else _trig_bundle(_radians(theta))
     # how theta changes with shaving off interfacial height
     arg = np.clip(
-        np.cos(theta_rad) + ((z / r) * np.sin(theta_rad)), -1.0, 1.0
+        cos_t + ((z / r) * sin_t), -1.0, 1.0
     )  # this uses not the planar spacing at
     # the surface but that at the interface; and if you derive it, you'll understand why
 
@@ -189,13 +303,20 @@ def calculate_surface_area(
     #        no real cap angle can exist after shaving interface.""",
     #        category = RuntimeWarning)
     #        arg = 1.0
-    theta = np.degrees(np.arccos(arg))
-    total_area = 2 * np.pi * (r**2) * alpha(theta)
+    # arg IS the cosine of the shaved cap angle, so alpha of that angle
+    # is 1 / (1 + arg) directly; the arccos -> degrees -> radians -> cos
+    # round-trip through alpha() cancels out. arg > -1 for every theta
+    # that passed validation above, so the pole is unreachable
+    total_area = 2 * np.pi * (r**2) / (1.0 + arg)
 
     return total_area  # A^2
 
 
-def calculate_total_volume(footprint_radius: float, theta: float = None) -> float:
+def calculate_total_volume(
+    footprint_radius: float,
+    theta: float = None,
+    trig: Tuple[float, float, float, float] = None,
+) -> float:
     """
     Calculate Nanoparticle volume, ASSUMING IT'S A SPHERICAL CAP
     Units: A^3
@@ -203,23 +324,38 @@ def calculate_total_volume(footprint_radius: float, theta: float = None) -> floa
     Requires:
         footprint_radius (float):   NP footprint radius. Ang
         theta (float):              contact angle. degrees
+        trig (Tuple):               output of _trig_bundle for this theta;
+                                    pass it if already evaluated, to skip
+                                    a second sin/cos
 
     Returns:
         volume (float):             NP volume. Ang^3
+
+    footprint_radius and theta may be scalars or equal-length arrays
     """
-    if theta in [0, 180]:
+    theta_arr = np.asarray(theta)
+    if np.any((theta_arr == 0) | (theta_arr == 180)):
         raise ValueError(f"Contact angle of {theta} not allowed")
-    if footprint_radius <= 5:
-        warnings.warn(
+    if np.any((theta_arr < 0) | (theta_arr > 180)):
+        raise ValueError(f"Invalid value of theta ({theta}) supplied")
+    if np.any(np.asarray(footprint_radius) <= 5):
+        _warn_once(
+            ("total_volume_small_r",),
             f"""A spherical cap may not work well for this footprint radius({footprint_radius})!
                 Mind!""",
             category=UserWarning,
         )
 
-    return (np.pi * (footprint_radius**3)) * alpha(theta) * beta(theta) / 3
+    *_, alpha_t, beta_t = trig if trig is not None else _trig_bundle(_radians(theta))
+
+    return (np.pi * (footprint_radius**3)) * alpha_t * beta_t / 3
 
 
-def calculate_atomic_density(element: str, facet: Tuple[int, int, int] = None) -> float:
+def calculate_atomic_density(
+    element: str,
+    facet: Tuple[int, int, int] = None,
+    constants: Tuple[float, float, float] = None,
+) -> float:
     """
     Calculate atomic density (i.e. atoms per unit surface area)
 
@@ -227,19 +363,43 @@ def calculate_atomic_density(element: str, facet: Tuple[int, int, int] = None) -
         element (str):              atomic symbol for atom type in the nanoparticle
         facet (Tuple[int,int,int]): facet, whether interfacial or support depends
                                     on the context
+        constants (Tuple[float,float,float]): output of calculate_constants;
+                                    pass it if already looked up, to skip
+                                    a second lookup
 
     Returns:
         atomic density (float) in atoms/A^2
     """
-    molar_volume, interplanar_spacing, _ = calculate_constants(
-        element=element, facet=facet
-    )
+    if constants is None:
+        # the (element, facet) space is tiny, so the derived density is
+        # memoized rather than re-divided on every lookup-path call
+        return _atomic_density_cached(
+            element, tuple(facet) if facet is not None else None
+        )
+    molar_volume, interplanar_spacing, _ = constants
     atomic_density = interplanar_spacing * N_A / molar_volume
 
     return atomic_density  # atoms/A^2
 
 
-def area_to_atoms(area: float, element: str, facet: Tuple[int, int, int] = None) -> int:
+@lru_cache(maxsize=None)
+def _atomic_density_cached(element: str, facet: Tuple[int, int, int]) -> float:
+    """calculate_atomic_density's lookup path, memoized per (element, facet)"""
+    # calculate_constants normalizes the key, raises on unsupported
+    # elements, and warns (once) on the default-facet fallback; the
+    # density itself comes from the table precomputed at import
+    calculate_constants(element=element, facet=facet)
+    element = element.capitalize()
+    facet = tuple(facet) if facet and facet[0] is not None else None
+    return _DENSITIES[(element, facet)][0]
+
+
+def area_to_atoms(
+    area: float,
+    element: str,
+    facet: Tuple[int, int, int] = None,
+    atomic_density: float = None,
+) -> int:
     """
     Convert area (in A^2) to number of atoms
 
@@ -248,14 +408,110 @@ def area_to_atoms(area: float, element: str, facet: Tuple[int, int, int] = None)
         element (str):              atomic symbol for atom type in the nanoparticle
         facet (Tuple[int,int,int]): facet, whether interfacial or support depends
                                     on the context
+        atomic_density (float):     atoms/A^2; pass it if already calculated,
+                                    to skip the constants lookup
 
     Returns:
         n_atoms (int):        Number of atoms in region, rounded to nearest integer
+                              (an integer array if area was an array)
+    """
+    if atomic_density is None:
+        atomic_density = calculate_atomic_density(element, facet)  # atoms/A^2
+    if np.ndim(area) == 0:
+        # scalar fast path; round() matches np.rint (half to even)
+        return round(float(area) * atomic_density)
+
+    return np.rint(area * atomic_density).astype(np.int64)
+
+
+def _batch_count(
+    counting_function,
+    elements,
+    rs,
+    thetas,
+    interface_facets,
+    surface_facets,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Run a per-particle counting function (calculate_by_volume or
+    calculate_by_area) over whole input columns at once
+
+    Rows sharing (element, interface facet, surface facet) are grouped
+    and computed in a single vectorized call; results are scattered into
+    four preallocated int64 output columns, so no list-of-tuples
+    transpose is ever built
+
+    This grouping is also the per-(element, facet) specialization point:
+    within a group the counting function resolves its constants and
+    densities once and the closed-form arithmetic runs over the whole
+    (r, theta) arrays, so no per-row kernel generation is needed
+
+    Requires:
+        counting_function:          calculate_by_volume or calculate_by_area
+        elements:                   (N,) array of atomic symbols
+        rs:                         (N,) array of footprint radii. Ang
+        thetas:                     (N,) array of contact angles. degrees
+        interface_facets:           (N, 3) int array; NO_FACET marks "not given"
+        surface_facets:             (N, 3) int array; NO_FACET marks "not given"
+
+    Returns:
+        perimeter_atoms, interfacial_atoms, surface_atoms, all_atoms
+        each a (N,) int64 array
+    """
+    n_rows = len(rs)
+    perimeter_atoms = np.empty(n_rows, dtype=np.int64)
+    interfacial_atoms = np.empty(n_rows, dtype=np.int64)
+    surface_atoms = np.empty(n_rows, dtype=np.int64)
+    total_atoms = np.empty(n_rows, dtype=np.int64)
+
+    # dictionary-encode the element column so grouping works on a flat
+    # int matrix, with no per-row Python string/tuple handling
+    unique_elements, element_ids = np.unique(np.asarray(elements), return_inverse=True)
+    combos = np.column_stack((element_ids, interface_facets, surface_facets)).astype(
+        np.int64
+    )
+    unique_combos, group_ids = np.unique(combos, axis=0, return_inverse=True)
+
+    # one stable argsort segments every group's row indices; slicing those
+    # segments replaces a full boolean rescan of group_ids per group
+    order = np.argsort(group_ids, kind="stable")
+    boundaries = np.searchsorted(
+        group_ids, np.arange(len(unique_combos) + 1), sorter=order
+    )
+
+    for group, combo in enumerate(unique_combos):
+        indices = order[boundaries[group] : boundaries[group + 1]]
+        interface_facet = tuple(int(j) for j in combo[1:4])
+        surface_facet = tuple(int(j) for j in combo[4:7])
+        peri, inter, surf, tot = counting_function(
+            element=unique_elements[combo[0]],
+            footprint_radius=rs[indices].astype(float),
+            theta=thetas[indices].astype(float),
+            # the NO_FACET sentinel means "not provided"; let the
+            # downstream lookup pick the element's default facet
+            interface_facet=None if interface_facet[0] == NO_FACET else interface_facet,
+            surface_facet=None if surface_facet[0] == NO_FACET else surface_facet,
+        )
+        perimeter_atoms[indices] = peri
+        interfacial_atoms[indices] = inter
+        surface_atoms[indices] = surf
+        total_atoms[indices] = tot
+
+    return perimeter_atoms, interfacial_atoms, surface_atoms, total_atoms
+
+
+def _volume_to_atoms_fast(volumes: np.ndarray, bulk_density: float) -> np.ndarray:
     """
-    atomic_density = calculate_atomic_density(element, facet)  # atoms/A^2
-    n_atoms = int(np.round(area * atomic_density))
+    Branch-free core of volume_to_atoms for a pre-computed bulk density
+    (atoms/A^3); volumes may be any shape and several regions can be
+    stacked into one array to share a single rint pass
 
-    return n_atoms
+    NaN volumes (degenerate geometry upstream, see
+    by_volume.calculate_volumes) count as zero atoms and are zeroed
+    IN PLACE, so pass a buffer you own
+    """
+    np.nan_to_num(volumes, copy=False, nan=0.0)
+    return np.rint(volumes * bulk_density).astype(np.int64)
 
 
 def volume_to_atoms(
@@ -273,14 +529,18 @@ def volume_to_atoms(
 
     Returns:
         n_atoms (int):              Number of atoms in region, rounded to nearest integer
+                                    (an integer array if volume was an array)
     """
     if not molar_volume:
         molar_volume, *_ = calculate_constants(element=element)
     #        print(molar_volume)
 
     bulk_density = N_A / molar_volume  # atom/A^3
-    ##set to zero in case interface_volume==0, see by_volume.calculate_volumes
-    n_atoms = np.round(volume * bulk_density)
-    n_atoms = 0 if np.isnan(n_atoms) else int(n_atoms)
-
-    return n_atoms
+    if np.ndim(volume) == 0:
+        # scalar fast path: builtin round() rounds half to even exactly
+        # like np.rint, without boxing the scalar into a 0-d array first
+        v = float(volume)
+        return round(v * bulk_density) if v == v else 0  # NaN counts as 0
+
+    # copy: the fast path zeroes NaNs in place and volume is the caller's
+    return _volume_to_atoms_fast(np.array(volume, dtype=float), bulk_density)
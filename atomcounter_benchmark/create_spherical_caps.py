@@ -18,22 +18,40 @@ from atomcounter_benchmark.atomistic_utils import (
     create_unit_support,
 )
 
-# from functools import lru_cache
+from functools import lru_cache
 
 
-# @lru_cache(maxsize=100)
+@lru_cache(maxsize=None)
 def _calculate_bulk_density(
     element: str,
 ) -> float:
     """
     Calculate bulk density in atoms/A^3,
     given the element symbol
+
+    Pure in element, so cached: sweeps call this once per conversion
+    and the ASE bulk() construction is all overhead after the first
     """
+    # callers pass capitalized symbols (one cache entry per element);
+    # this guards the odd direct call with different casing
+    element = element.capitalize()
     atoms = bulk(element)
     volume = atoms.get_volume()
     return len(atoms) / volume
 
 
+@lru_cache(maxsize=None)
+def _bulk_min_length(element: str) -> float:
+    """
+    Shortest primitive-cell vector of the element's bulk structure, in Ang
+
+    Depends only on the element, so cached alongside the bulk density:
+    create_sphere needs it to size its supercell and would otherwise
+    rebuild the primitive cell per sphere
+    """
+    return float(bulk(element).cell.lengths().min())
+
+
 def _atoms_to_radius(
     n_atoms: int,
     element: str,
@@ -64,6 +82,9 @@ def _radius_to_atoms(
     return volume * bulk_density  # n_atoms
 
 
+_SUPERCELL_CACHE = {}  # (element, multiplying_factor) -> repeated bulk supercell
+
+
 def create_sphere(
     *,  # must use this function by specifying the keywords too, not just values
     element: str,
@@ -103,20 +124,36 @@ def create_sphere(
         )
     diameter = radius * 2
     ##build a bulk cell of safely larger dimensions than the diameter
-    base_atoms = bulk(element)
     required_length = 2.5 * diameter
-    current_length = min(base_atoms.cell.lengths())
+    current_length = _bulk_min_length(element)
     multiplying_factor = math.ceil(required_length / current_length)
-    base_atoms *= (multiplying_factor, multiplying_factor, multiplying_factor)
+    # a radius sweep rebuilds the same repeated supercell over and over;
+    # cache it per (element, factor). everything below only reads from it
+    # (the mask subscript copies), so sharing one object is safe
+    key = (element, multiplying_factor)
+    base_atoms = _SUPERCELL_CACHE.get(key)
+    if base_atoms is None:
+        base_atoms = bulk(element) * (
+            multiplying_factor,
+            multiplying_factor,
+            multiplying_factor,
+        )
+        _SUPERCELL_CACHE[key] = base_atoms
     ##get the center of mass and draw a circle of the specified diameter around it
+    # one vectorized distance computation and mask-subscript, instead of a
+    # Python-level norm call per atom plus a per-Atom rebuild; comparing
+    # squared distances also skips the N square roots
     com = base_atoms.get_center_of_mass()
-    atoms_to_keep = []
-    for index, atom in enumerate(base_atoms):
-        position = atom.position
-        distance = np.linalg.norm(position - com, ord=2)
-        if distance <= radius:
-            atoms_to_keep.append(atom)
-    atoms_to_keep = Atoms(atoms_to_keep)
+    diffs = base_atoms.positions - com
+    squared_distances = np.einsum("ij,ij->i", diffs, diffs)
+    radius_sq = radius * radius  # compare d^2 <= r^2; no sqrt anywhere
+    atoms_to_keep = base_atoms[squared_distances <= radius_sq]
+    # the old Atoms(list-of-Atom) rebuild reparsed every Atom proxy and
+    # dropped the supercell's cell and pbc; mask-subscripting copies the
+    # symbol/position arrays wholesale but keeps cell and pbc, so drop
+    # them explicitly
+    atoms_to_keep.set_cell([0.0, 0.0, 0.0])
+    atoms_to_keep.pbc = False
 
     return atoms_to_keep
 
@@ -125,9 +162,9 @@ def cut_particle(atoms: Atoms, angle: float) -> Atoms:
     """
     Cut symetric particle into an asymetric one of a specified contact angle
     """
-    atoms = atoms.copy()
-    positions = atoms.get_positions()
-    z_positions = positions[:, 2]
+    # no up-front copy needed: mask-subscripting below already returns a
+    # new Atoms object, and nothing here mutates the input
+    z_positions = atoms.positions[:, 2]
 
     ##calculate the min and max position along the z-axis
     z_min = np.min(z_positions)
@@ -25,7 +25,7 @@ Just to note it here, in case a future version has me putting back alphashape, h
 
 import pandas as pd
 from argparse import ArgumentParser
-from copy import deepcopy
+from functools import lru_cache
 from ase.build import bulk
 from tqdm import tqdm
 import statistics
@@ -40,13 +40,16 @@ from sys import argv, exit
 from ase.geometry.analysis import Analysis
 from typing import Tuple, Literal, List, Union
 from ase.neighborlist import natural_cutoffs, NeighborList
+from scipy.spatial import cKDTree
 import warnings
 from os import system, environ
 from atomcounter_benchmark.atomistic_utils import (
     divider,
     setup_neighborlist,
     setup_analyzer,
-    NANOPARTICLE_ELEMENT,  # SKIN
+    _symbols,
+    NANOPARTICLE_ELEMENT,
+    SKIN,
 )
 from joblib import Parallel, delayed
 from ascii_colors import ASCIIColors
@@ -66,6 +69,43 @@ NL_SKIN = 0.05  # Ang; nl skin for distinguishing surface NP atoms;
 # not structures from MD; this value seems to work well
 
 
+@lru_cache(maxsize=None)
+def _max_natural_cutoff(elements_tuple: Tuple[str, ...]) -> float:
+    """
+    Largest natural cutoff among the given elements, doubled
+    (no need to search for neighbors beyond this distance)
+
+    Cached by element tuple: a sweep over thousands of frames of the
+    same composition otherwise rebuilds a 1-atom Atoms per element
+    per frame
+    """
+    return np.max([natural_cutoffs(Atoms(element)) for element in elements_tuple]) * 2
+
+
+@lru_cache(maxsize=None)
+def _default_coord_cutoff(np_element: str) -> int:
+    """
+    Coordination cutoff separating bulk from surface for the NP element's
+    crystal system (12 for fcc/hcp, 8 for bcc)
+
+    Memoized per element: the ASE bulk() + Bravais-lattice lookup is pure
+    dispatch and was being re-run on every frame
+    """
+    lattice = bulk(np_element).cell.get_bravais_lattice().__class__.__name__
+    if lattice in ["FCC", "HCP", "HEX"]:  # should confirm later, but it seems ASE
+        # has only hex not hcp (they mean the same, I suppose)
+        return FCC_AND_HCP_COORD_CUTOFF
+    if lattice == "BCC":
+        return BCC_COORD_CUTOFF
+    warnings.warn(
+        f"""NP element's crystal system is neither fcc, hcp, nor bcc!
+    Setting coordination cutoff to that of fcc/hcp ({FCC_AND_HCP_COORD_CUTOFF})!
+    """,
+        category=UserWarning,
+    )
+    return FCC_AND_HCP_COORD_CUTOFF
+
+
 def get_interface(
     atoms: Atoms,
     nl: NeighborList = None,
@@ -90,8 +130,8 @@ def get_interface(
         scaling_factor (float):             scaling factor for covalent radii. Optional
                                             Advised to be > 1.0 to fully capture the interface
     Returns:
-        np_interfacial_indices (List[int]):         indices of interfacial (+ perimeter) NP atoms
-        support_interfacial_indices (List[int]):    indices of interfacial support atoms
+        np_interfacial_indices:         sorted int array of interfacial (+ perimeter) NP atom indices
+        support_interfacial_indices:    sorted int array of interfacial support atom indices
 
     If no NP-Support bonds found,
         Returns:    None, None
@@ -103,48 +143,48 @@ def get_interface(
     if isinstance(support_elements, str):
         support_elements = [support_elements]
 
-    if not analyzer:
-        if not nl:  # reuse neighborlist if given
-            natural_cutoff = (
-                np.max([natural_cutoffs(Atoms(element)) for element in elements]) * 2
-            )  # no need to search beyond this distance
+    if not nl:  # reuse neighborlist if given
+        if analyzer:
+            nl = analyzer.nl[0]  # Analysis keeps its neighborlists in a list
+        else:
+            natural_cutoff = _max_natural_cutoff(tuple(sorted(elements)))
             nl = setup_neighborlist(atoms, scaling_factor, radial_cutoff=natural_cutoff)
             nl.update(atoms)
 
-        analyzer = setup_analyzer(
-            atoms, neighborlist=nl
-        )  # reuse Analysis object if given
-
-    NP_Support_bonds = {
-        e.capitalize(): analyzer.get_bonds(e.capitalize(), np_element, unique=True)[0]
-        for e in support_elements
-    }
-    support_interfacial_indices, np_interfacial_indices = [], []
-    for support_e, bonds in NP_Support_bonds.items():
-        if bonds:
-            np_interfacial_indice, support_interface_indice = zip(
-                *[(j, i) for (i, j) in bonds]
-            )
-            np_interfacial_indice = list(np_interfacial_indice)
-            support_interface_indice = list(support_interface_indice)
-        else:
+    # scan the neighborlist directly instead of one analyzer.get_bonds pass
+    # per support element: get_bonds walks every bond in the system each
+    # call, then we re-filtered its tuples in Python. One walk over the NP
+    # atoms with a numpy membership mask on the neighbors does the same job
+    support_elements = [e.capitalize() for e in support_elements]
+    symbols = _symbols(atoms)
+    # accumulate index *arrays* and concatenate once at the end, instead
+    # of extending Python lists element by element
+    np_parts, sup_parts = [], []
+    for i in np.flatnonzero(symbols == np_element):
+        neigh, _ = nl.get_neighbors(int(i))
+        support_neigh = neigh[np.isin(symbols[neigh], support_elements)]
+        if support_neigh.size:
+            np_parts.append(np.full(support_neigh.size, i, dtype=np.int64))
+            sup_parts.append(support_neigh)
+
+    sup_idx = (
+        np.concatenate(sup_parts) if sup_parts else np.array([], dtype=np.int64)
+    )
+    bonded_support_elements = set(symbols[sup_idx])
+    for support_e in support_elements:
+        if support_e not in bonded_support_elements:
             warnings.warn(
                 f"""There are no {support_e}-{np_element} bonds in your system!
             This may be a very small cluster""",
                 category=RuntimeWarning,
             )
-            np_interfacial_indice = list()
-            support_interface_indice = list()
-
-        support_interfacial_indices.extend(support_interface_indice)
-        np_interfacial_indices.extend(np_interfacial_indice)
 
-    if not (support_interfacial_indices and np_interfacial_indices):
+    if not sup_idx.size:
         print(f"No NP-Support bonds found! Failed!")
         return None, None
 
-    support_interfacial_indices = list(np.unique(support_interfacial_indices))
-    np_interfacial_indices = list(np.unique(np_interfacial_indices))
+    support_interfacial_indices = np.unique(sup_idx)
+    np_interfacial_indices = np.unique(np.concatenate(np_parts))
 
     # CAUTION!! np_interfacial_indices includes perimeter atoms.
     # To separate out the perimeter, use get_perimeter on results from this function
@@ -209,30 +249,43 @@ def get_perimeter(
         ]
 
     # criterion 2: coordination threshold
-    ##we have to create a new nl because we are now using a subset of the provided Atoms object
-    neighbors = NeighborList(
-        cutoffs=natural_cutoffs(np_interface, mult=INTERFACE_SCALING),
-        self_interaction=False,
-        bothways=True,
-    )
-    neighbors.update(np_interface)
-    CNs = [
-        (atom_index, len(neighbors.get_neighbors(atom_index)[0]))
-        for (atom_index, _) in enumerate(np_interface)
-    ]  # get number of neighbors for each interfacial NP atom
+    ##we only need coordination numbers on a non-periodic, single-element
+    ##subset, so a compiled cKDTree radius query replaces the ASE
+    ##NeighborList we used to rebuild here. the subset's cutoffs are all
+    ##equal, so the NeighborList criterion (spheres of radius cutoff+skin
+    ##overlap) collapses to one query radius
     # remember: only interface-interface bonds are considered
-    neighbor_counts = [num_neighbors for (_, num_neighbors) in CNs]
-    medianCN, maxCN = np.median(neighbor_counts), max(neighbor_counts)
+    cutoff = natural_cutoffs(np_interface, mult=INTERFACE_SCALING)[0]
+    tree = cKDTree(np_interface.positions)
+    neighbor_counts = (
+        tree.query_ball_point(
+            np_interface.positions, r=2.0 * (cutoff + SKIN), return_length=True
+        )
+        - 1  # each atom finds itself
+    ).astype(np.int32)
+    # one O(N) partition yields the median and confines the max to the
+    # upper half, instead of np.median's full sort plus a separate max pass
+    n = neighbor_counts.size
+    k = n // 2
+    part = np.partition(neighbor_counts, k if n % 2 else (k - 1, k))
+    medianCN = part[k] if n % 2 else 0.5 * (part[k - 1] + part[k])
+    maxCN = part[k:].max()
     thresholdCN = max(medianCN, maxCN)  # - 1)
+    already_flagged = set(perimeter_indices)
     missed_perimeter_indices = [
-        atom_index
-        for (atom_index, num_neighbors) in CNs
-        if (num_neighbors < thresholdCN and atom_index not in perimeter_indices)
+        int(atom_index)
+        for atom_index in np.flatnonzero(neighbor_counts < thresholdCN)
+        if atom_index not in already_flagged
     ]
     perimeter_indices.extend(missed_perimeter_indices)
 
     # convert the perimeter indices to the indices in the Atoms object
-    perimeter_indices = [np_interfacial_indices[i] for i in perimeter_indices]
+    # (one fancy-indexing gather, not a per-index list lookup)
+    perimeter_indices = (
+        np.asarray(np_interfacial_indices)[perimeter_indices].tolist()
+        if perimeter_indices
+        else []
+    )
 
     return perimeter_indices
 
@@ -282,27 +335,17 @@ def get_np_surface_by_CN(
 
     # apply criterion
     if not coord_cutoff:
-        lattice = bulk(np_element).cell.get_bravais_lattice().__class__.__name__
-        if lattice in ["FCC", "HCP", "HEX"]:  # should confirm later, but it seems ASE
-            # has only hex not hcp (they mean the same, I suppose)
-            coord_cutoff = FCC_AND_HCP_COORD_CUTOFF
-        elif lattice == "BCC":
-            coord_cutoff = BCC_COORD_CUTOFF
-        else:
-            warnings.warn(
-                f"""NP element's crystal system is neither fcc, hcp, nor bcc!
-            Setting coordination cutoff to that of fcc/hcp ({FCC_AND_HCP_COORD_CUTOFF})!
-            """,
-                category=UserWarning,
-            )
-
-    CN = [
-        (index, len(nl.get_neighbors(index)[0]))
-        for index, i in enumerate(atoms)
-        if i.symbol == np_element
+        coord_cutoff = _default_coord_cutoff(np_element)
+
+    # one symbol-array mask picks out the NP atoms, instead of building an
+    # Atom proxy per atom just to read .symbol; neighbors are then only
+    # fetched for those indices
+    np_indices = np.flatnonzero(_symbols(atoms) == np_element)
+    surface_plus_interface_indices = [
+        int(index)
+        for index in np_indices
+        if len(nl.get_neighbors(int(index))[0]) != coord_cutoff
     ]
-    bulk_indices = [i for i, j in CN if j == coord_cutoff]
-    surface_plus_interface_indices = [i for i, j in CN if i not in bulk_indices]
 
     return surface_plus_interface_indices
 
@@ -375,9 +418,7 @@ def discriminate(
 
     if not analyzer:
         if not nl:  # reuse neighborlist if given
-            natural_cutoff = (
-                np.max([natural_cutoffs(Atoms(element)) for element in elements]) * 2
-            )  # no need to search beyond this distance
+            natural_cutoff = _max_natural_cutoff(tuple(sorted(elements)))
             nl = setup_neighborlist(
                 atoms, scaling_factor=interface_scaling, radial_cutoff=natural_cutoff
             )  # , skin = NL_SKIN) adding this ruins things!
@@ -387,12 +428,10 @@ def discriminate(
             atoms, neighborlist=nl
         )  # reuse Analysis object if given
 
-    nps = [index for index, _ in enumerate(atoms) if atoms[index].symbol == np_element]
-    substrate = [
-        index
-        for index, _ in enumerate(atoms)
-        if atoms[index].symbol in support_elements
-    ]
+    # masks over the cached symbol array, not per-atom .symbol lookups
+    symbols = _symbols(atoms)
+    nps = np.flatnonzero(symbols == np_element).tolist()
+    substrate = np.flatnonzero(np.isin(symbols, support_elements)).tolist()
 
     try:
         np_interface_plus_perimeter, substrate_interface = get_interface(
@@ -410,7 +449,12 @@ def discriminate(
             do_alphashape=do_alphashape,
         )
 
-        np_interface = [i for i in np_interface_plus_perimeter if i not in np_perimeter]
+        # set lookups: the "not in list" versions rescanned a list per
+        # atom, quadratic in the NP size
+        perimeter_set = set(np_perimeter)
+        np_interface = [
+            i for i in np_interface_plus_perimeter if i not in perimeter_set
+        ]
         nl = None  # unfortunately we have to reset in order to set skin to zero for the surface discriminaion
         np_surface_plus_interface = get_np_surface_by_CN(
             atoms,
@@ -421,10 +465,14 @@ def discriminate(
             coord_cutoff=coord_cutoff,
         )
 
+        interface_plus_perimeter_set = set(np_interface_plus_perimeter)
         np_surface = [
-            i for i in np_surface_plus_interface if i not in np_interface_plus_perimeter
+            i
+            for i in np_surface_plus_interface
+            if i not in interface_plus_perimeter_set
         ]
-        np_bulk = [i for i in nps if i not in np_surface_plus_interface]
+        surface_plus_interface_set = set(np_surface_plus_interface)
+        np_bulk = [i for i in nps if i not in surface_plus_interface_set]
 
     except TypeError:  # get_interface returned None, None
         ASCIIColors.red("get_interface probably failed")
@@ -450,7 +498,11 @@ def discriminate(
     )
 
 
-if __name__ == "__main__":
+def main(argv: List[str] = None) -> None:
+    """
+    Command-line entry point; argv defaults to sys.argv, but in-process
+    callers (e.g. the benchmark driver) can pass their own list
+    """
     parser = ArgumentParser(
         description="""Splits up a supported NP into surface, substrate, bulk, perimeter, and interface
     Also calculates interfacial radius by any/both of two methods if requested"""
@@ -521,7 +573,7 @@ if __name__ == "__main__":
 
     do_alphashape = False
 
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
     output_file = args.output
     output_traj = args.traj_output
     atoms = read(args.traj, ":")
@@ -533,7 +585,16 @@ if __name__ == "__main__":
         for image in atoms
     ]
 
-    with Parallel(n_jobs=processes) as parallel:
+    # batch frames per dispatch: loky workers are long-lived, so the
+    # neighborlist cache in atomistic_utils already lets frames that share
+    # atom count and cutoffs reuse one NeighborList within a worker;
+    # batching just cuts the per-task dispatch overhead on top of that.
+    # max_nbytes below joblib's 1M default makes it hand the position
+    # arrays inside each Atoms object to workers as read-only memmaps
+    # (typical frames are a few hundred KB) instead of repickling them
+    with Parallel(
+        n_jobs=processes, batch_size=16, max_nbytes="100K", mmap_mode="r"
+    ) as parallel:
         results = parallel(
             delayed(discriminate)(
                 image,
@@ -573,13 +634,19 @@ if __name__ == "__main__":
             np_perimeter[index],
         )
 
+        if not isinstance(np_surf, list):
+            continue  # discriminate failed on this frame; nothing to recolor
+
         # hardcoded; should include in args sometime but this is sufficient for tests
-        for i in np_int:
-            image[i].symbol = "Cu"
-        for i in np_peri:
-            image[i].symbol = "Mo"
-        for i in np_surf:
-            image[i].symbol = "Pd"
+        # three fancy-indexed assignments on the symbol array, instead of
+        # one Atom-proxy attribute write per atom
+        # object dtype: a fixed-width string array would truncate the new
+        # two-letter symbols if every original symbol were one letter
+        syms = np.array(image.get_chemical_symbols(), dtype=object)
+        syms[np_int] = "Cu"
+        syms[np_peri] = "Mo"
+        syms[np_surf] = "Pd"
+        image.set_chemical_symbols(syms.tolist())
 
     print("Saving results")
     write(output_traj, atoms)
@@ -600,3 +667,7 @@ if __name__ == "__main__":
         }
     )
     df.to_csv(output_file, index=False)
+
+
+if __name__ == "__main__":
+    main()
@@ -6,15 +6,26 @@ The two input files must share the same column headers
 (e.g., Perimeter, Interface, Surface, Total).
 """
 
+import sys
 from sys import exit
 from argparse import ArgumentParser
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
+import matplotlib
 
+if "--show" not in sys.argv:
+    # save-only runs don't need a GUI event loop; Agg skips the
+    # interactive backend's window and font-cache setup entirely
+    matplotlib.use("Agg")
+# pyplot itself is imported inside plot_column, after the backend choice
+# is settled, so importing this module (e.g. for its helpers) does not
+# initialize a backend
 
-def read_args():
+
+def read_args(argv: list = None):
+    """argv defaults to sys.argv; in-process callers can pass their own"""
     parser = ArgumentParser()
     parser.add_argument("csv_a", help="first CSV file. Atomistic output")
     parser.add_argument("csv_b", help="second CSV file. AtomCounter output")
@@ -30,89 +41,185 @@ def read_args():
         "--output_dir", type=str, help="directory where parity plots should be saved"
     )
 
-    return parser.parse_args()
-
-
-def main():
-    args = read_args()
-    df_a = pd.read_csv(args.csv_a)  # atomistic output
-    df_b = pd.read_csv(args.csv_b)  # atomcounter output
-    df_c = pd.read_csv(args.csv_c)  # input to both
-
-    df_a.columns = df_a.columns.str.strip()
-    df_b.columns = df_b.columns.str.strip()
-    df_c.columns = df_c.columns.str.strip()
-
-    common_cols = df_a.columns.intersection(df_b.columns)
-    if common_cols.empty:
-        exit("Error: the two files share no common column headers.")
+    return parser.parse_args(argv)
+
+
+def read_cached(path: str, usecols: list = None, dtype=None) -> pd.DataFrame:
+    """
+    Read a CSV through a Feather sidecar cache
+
+    Repeated regression runs replot the same files; Feather reads are
+    much faster than re-parsing CSV, so cache next to the source and
+    reuse while the source is unchanged (by mtime). usecols (matched
+    against stripped header names) and dtype pass through to read_csv
+    and are part of the cache name, so different column subsets do not
+    collide
+    """
+    source = Path(path)
+    tag = "" if not usecols else "." + "-".join(c.lower() for c in sorted(usecols))
+    cache = source.with_suffix(source.suffix + tag + ".feather")
+    if cache.exists() and cache.stat().st_mtime >= source.stat().st_mtime:
+        return pd.read_feather(cache)
+    wanted = None if usecols is None else set(usecols)
+    df = pd.read_csv(
+        source,
+        usecols=None if wanted is None else (lambda c: c.strip() in wanted),
+        dtype=dtype,
+    )
+    df.columns = df.columns.str.strip()
+    try:
+        df.to_feather(cache)
+    except (ImportError, ValueError):
+        pass  # no pyarrow, or unserializable frame; the cache is best-effort
+    return df
+
+
+def plot_column(
+    col: str,
+    x: np.ndarray,
+    y: np.ndarray,
+    lo: float,
+    hi: float,
+    theta: np.ndarray,
+    curv_radii: np.ndarray,
+    diff: np.ndarray,
+    out_dir: str,
+    show: bool = False,
+) -> tuple:
+    """
+    Render the parity plot and difference heatmap for one column and
+    return the two output paths
+
+    Safe to run in a worker process (Agg is forced when not showing),
+    which is how main() renders all columns in parallel
+    """
+    if not show:
+        matplotlib.use("Agg", force=True)
+    import matplotlib.pyplot as plt
 
-    out_dir = args.output_dir
     figsize = (6, 6)
     plt.rcParams.update({"font.size": 15,
         "font.family": "arial"}
         )
     vmax, vmin = 100, 0
 
-    for col in common_cols:
+    ##create parity plots
+    # one figure serves both plots: the heatmap below clears and reuses
+    # this canvas rather than paying a second figure/canvas setup
+    fig, ax_parity = plt.subplots(figsize=figsize)
+    # rasterized: flatten the points to one image layer at savefig
+    # time rather than constructing a vector path per point
+    ax_parity.scatter(x, y, c="tab:blue", rasterized=True)
+    ax_parity.plot([lo, hi], [lo, hi], "k--", lw=1)
+    ax_parity.set_xlabel(f"{col} atoms (atomistic)")
+    ax_parity.set_ylabel(f"{col} atoms (atomcounter)")
+    ax_parity.set_title(f"Parity plot of results: {col}")
+    ax_parity.set_xlim(lo, hi)
+    ax_parity.set_ylim(lo, hi)
+    if col == "Total":
+        for tick in ax_parity.get_xticklabels():
+            tick.set_rotation(25)
+            tick.set_ha("right")
+
+    fig.tight_layout()
+    out_path_1 = out_dir + f"/parity_{col.lower()}.png"
+    fig.savefig(out_path_1, dpi=150)
+    if show:
+        plt.show()
+
+    ##create heatmap of differences
+    fig.clf()
+    ax_heat = fig.add_subplot()
+    sc = ax_heat.scatter(
+        theta,
+        curv_radii,
+        c=diff,
+        cmap="coolwarm",
+        s=60,
+        vmin=vmin,
+        vmax=vmax,
+        rasterized=True,
+    )
+    cbar = fig.colorbar(sc, ax=ax_heat)
+    cbar.set_label("Absolute Percent Difference (%)")
+    ax_heat.set_ylabel(r"$R$ (Å)")
+    ax_heat.set_xlabel("θ (°)")
+    ax_heat.set_title(f"Heatmap of differences in results: {col}")
+    fig.tight_layout()
+    out_path_2 = out_dir + f"/heatmap_{col.lower()}.png"
+    fig.savefig(out_path_2, dpi=150)
+    if show:
+        plt.show()
+    plt.close(fig)
+
+    return out_path_1, out_path_2
+
+
+def main(argv: list = None):
+    args = read_args(argv)
+
+    # peek at the headers alone first, so the full reads can select just
+    # the shared columns and parse them as compact float32 straight away
+    cols_a = pd.read_csv(args.csv_a, nrows=0).columns.str.strip()
+    cols_b = pd.read_csv(args.csv_b, nrows=0).columns.str.strip()
+    common_cols = cols_a.intersection(cols_b)
+    if common_cols.empty:
+        exit("Error: the two files share no common column headers.")
+
+    df_a = read_cached(
+        args.csv_a, usecols=list(common_cols), dtype=np.float32
+    )  # atomistic output
+    df_b = read_cached(
+        args.csv_b, usecols=list(common_cols), dtype=np.float32
+    )  # atomcounter output
+    df_c = read_cached(args.csv_c)  # input to both
+
+    out_dir = args.output_dir
+
+    theta = df_c["Theta"].values
+    curv_radii = df_c["R (A)"].values
+
+    # one vectorized sweep for all axis bounds, instead of four pandas
+    # reductions per column inside the plot loop
+    A = df_a[common_cols].to_numpy()
+    B = df_b[common_cols].to_numpy()
+    los = np.minimum(A.min(axis=0), B.min(axis=0))
+    his = np.maximum(A.max(axis=0), B.max(axis=0))
+    pads = 0.05 * (his - los)
+    los, his = los - pads, his + pads
+
+    jobs = []
+    for position, col in enumerate(common_cols):
 
-        x = df_a[col]
-        y = df_b[col]
+        x = A[:, position]
+        y = B[:, position]
 
 #        ss_res = ((x - y) ** 2).sum()
 #        ss_tot = ((x - x.mean()) ** 2).sum()
 #        r2 = 1 - ss_res / ss_tot if ss_tot != 0 else float("nan")
 #        print(col, r2)
 
-        diff = np.abs(100 * (x - y) / y)
+        # pandas used to silence the zero-division here; do the same
+        with np.errstate(divide="ignore", invalid="ignore"):
+            diff = np.abs(100 * (x - y) / y)
         diff[~np.isfinite(diff)] = np.nan
 
-        theta = df_c["Theta"].values
-        curv_radii = df_c["R (A)"].values
-
-        lo = min(x.min(), y.min())
-        hi = max(x.max(), y.max())
-        pad = 0.05 * (hi - lo)
-        lo, hi = lo - pad, hi + pad
-
-        ##create parity plots
-        plt.figure(figsize=figsize)
-        plt.scatter(x, y, c="tab:blue")
-        plt.plot([lo, hi], [lo, hi], "k--", lw=1)
-        plt.xlabel(f"{col} atoms (atomistic)")
-        plt.ylabel(f"{col} atoms (atomcounter)")
-        plt.title(f"Parity plot of results: {col}")
-        plt.xlim(lo, hi)
-        plt.ylim(lo, hi)
-        if col == "Total":
-            ax = plt.gca()
-            for tick in ax.get_xticklabels():
-                tick.set_rotation(25)
-                tick.set_ha("right")
-
-        plt.tight_layout()
-        out_path_1 = out_dir + f"/parity_{col.lower()}.png"
-        plt.savefig(out_path_1, dpi=150)
-        if args.show:
-            plt.show()
-        print(f"Saved {out_path_1}")
-
-        ##create heatmap of differences
-        plt.close()
-        plt.figure(figsize=figsize)
-        sc = plt.scatter(theta, curv_radii, c=diff, cmap="coolwarm", s=60, vmin=vmin, vmax=vmax)
-        cbar = plt.colorbar(sc)
-        cbar.set_label("Absolute Percent Difference (%)")
-        plt.ylabel(r"$R$ (Å)")
-        plt.xlabel("θ (°)")
-        plt.title(f"Heatmap of differences in results: {col}")
-        plt.tight_layout()
-        out_path_2 = out_dir + f"/heatmap_{col.lower()}.png"
-        plt.savefig(out_path_2, dpi=150)
-        if args.show:
-            plt.show()
-        plt.close()
-        print(f"Saved {out_path_2}")
+        jobs.append(
+            (col, x, y, los[position], his[position], theta, curv_radii, diff, out_dir)
+        )
+
+    if args.show:
+        # interactive windows only work in this process, so stay serial
+        for job in jobs:
+            for out_path in plot_column(*job, show=True):
+                print(f"Saved {out_path}")
+    else:
+        # each column's two PNGs are independent; render them across cores
+        with ProcessPoolExecutor() as executor:
+            futures = [executor.submit(plot_column, *job) for job in jobs]
+            for future in futures:
+                for out_path in future.result():
+                    print(f"Saved {out_path}")
 
 
 if __name__ == "__main__":
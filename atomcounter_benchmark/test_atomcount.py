@@ -4,18 +4,17 @@ from making an approximate atomistic model for nanoparticles of an FCC
 lattice and flat interface
 """
 
-import subprocess
-from ase.io import write
+import contextlib
+import importlib
+from ase.io.trajectory import Trajectory
 import shlex
 import sys
 from os import system, environ, makedirs
 import numpy as np
-import pandas as pd
-from itertools import product
+import csv
 from ase import Atoms
 from tqdm import tqdm
 from typing import List, Union, Tuple, Literal
-from ase.visualize import view
 import warnings
 from argparse import ArgumentParser
 from pathlib import Path
@@ -29,8 +28,14 @@ from atomcounter_benchmark.atomistic_utils import (
     scaler,
     create_unit_support,
 )
+from joblib import Parallel, delayed
+from atomcounter_benchmark import discrimination
+from NanoparticleAtomCounter.cli.atom_count import main as atom_count_main
 import pytest
 
+# the module file name contains a dash, so it needs importlib
+plot_parity = importlib.import_module("atomcounter_benchmark.plot-parity")
+
 MIN_ANGLE = 30
 MAX_ANGLE = 160
 MIN_RADIUS = 10  # Ang
@@ -38,13 +43,47 @@ MAX_RADIUS = 30  # Ang
 N_ANGLES = 5
 N_RADII = 5
 PROCESSES = -1
-OUTPUT_TRAJECTORY = "atoms.traj"
+OUTPUT_TRAJECTORY = "atoms.traj"  # ASE's ULM container: binary arrays,
+# appended frame by frame by the streaming Trajectory writer
 NP_ELEMENTS = ["Ag"]
 SUPPORT_ELEMENTS = ["graphene"]  # , "au"]
 
 script_dir = Path(__file__).resolve().parent
 
 
+_SPHERE_CACHE = {}  # (element, radius) -> full sphere, shared across angles
+
+
+def _sphere(element: str, radius: float) -> Atoms:
+    """
+    create_sphere memoized on (element, radius): the sweep cuts the same
+    sphere at every contact angle, so each one only needs building once
+    per worker. Callers must not mutate the returned object
+    (cut_particle doesn't; its mask subscript copies)
+    """
+    key = (element, radius)
+    atoms = _SPHERE_CACHE.get(key)
+    if atoms is None:
+        atoms = create_sphere(element=element, radius=radius)
+        _SPHERE_CACHE[key] = atoms
+    return atoms
+
+
+def _build_image(r: float, theta: float, nanoparticle: str, support: str) -> Atoms:
+    """
+    Build one supported spherical-cap model
+    (top level so joblib workers can pickle it)
+    """
+    atoms = _sphere(nanoparticle, r)
+    atoms = cut_particle(atoms, theta)
+    # create_unit_support is lru_cached, so every model after the first
+    # in a worker reuses the same unit cell rather than rebuilding it
+    unit_support = create_unit_support(support)
+    atoms = scaler(image=atoms, unit_support=unit_support)
+    atoms.info["np_element"] = nanoparticle
+    return atoms
+
+
 def create_outputdir() -> str:
     home_dir = environ["HOME"]
     output_dir = f"{home_dir}/nanoparticle_atom_counter_benchmark/"
@@ -116,24 +155,40 @@ def create_trajectory(
     radii_angstrom = np.linspace(min_radius, max_radius, n_radii)
     contact_angles = np.linspace(min_angle, max_angle, n_angles)
 
-    atoms_list: List[Atoms] = []
-
-    for r in tqdm(
-        radii_angstrom,
-        total=len(radii_angstrom),
-        desc="creating atomistic models of the requested systems",
-    ):
-        for theta in contact_angles:
-            for nanoparticle in nanoparticles:
-                for support in supports:
-                    atoms = create_sphere(element=nanoparticle, radius=r)
-                    atoms = cut_particle(atoms, theta)
-                    unit_support = create_unit_support(support)
-                    atoms = scaler(image=atoms, unit_support=unit_support)
-                    atoms.info["np_element"] = nanoparticle
-                    atoms_list.append(atoms)
-
-    write(output_trajectory, atoms_list)
+    # structure-of-arrays parameter grid: one meshgrid ravel per column
+    # instead of materializing a list of per-combination tuples; ij
+    # indexing raveled matches product()'s row order, which
+    # run_atomistic's grid relies on.
+    # each (radius, angle, element, support) model is independent, so build
+    # them across cores (loky workers, so _sphere's and
+    # create_unit_support's caches persist within each worker) just like
+    # discrimination.py does for its frames; Parallel preserves input order.
+    # return_as='generator' streams each finished model straight into the
+    # trajectory writer, so peak memory holds a few in-flight frames rather
+    # than the whole sweep
+    R_col, T_col, E_col, S_col = (
+        grid.ravel()
+        for grid in np.meshgrid(
+            radii_angstrom, contact_angles, nanoparticles, supports, indexing="ij"
+        )
+    )
+    with Trajectory(output_trajectory, "w") as trajectory, Parallel(
+        n_jobs=PROCESSES, return_as="generator", batch_size=8
+    ) as parallel:
+        images = parallel(
+            delayed(_build_image)(float(r), float(theta), str(nanoparticle), str(support))
+            for r, theta, nanoparticle, support in zip(R_col, T_col, E_col, S_col)
+        )
+        for atoms in tqdm(
+            images,
+            total=n_calculations,
+            desc="creating atomistic models of the requested systems",
+            # piped CI runs don't need ANSI repaints; interactive ones
+            # don't need them more than once a second
+            disable=not sys.stderr.isatty(),
+            mininterval=1.0,
+        ):
+            trajectory.write(atoms)
     print("created and written atoms objects")
 
     return contact_angles, radii_angstrom, nanoparticles, supports, n_calculations
@@ -173,9 +228,11 @@ def run_atomistic(
 
     """
     print("discriminating...")
-    command = shlex.split(
-        f"python {script_dir}/discrimination.py"
-        f" -t {trajectory_file} -p {processes} -o {atomistic_output}"
+    # call the discrimination entry point in this interpreter instead of
+    # shelling out to a fresh python: no startup or re-import of
+    # numpy/ase, and the same .out/.err files via redirection
+    argv = shlex.split(
+        f"-t {trajectory_file} -p {processes} -o {atomistic_output}"
         f" -to {new_atoms_output}"
     )
 
@@ -183,25 +240,26 @@ def run_atomistic(
     discrimination_err = output_dir + "discrimination.err"
 
     with open(discrimination_out, "w") as out_f, open(discrimination_err, "w") as err_f:
-        subprocess.run(command, stdout=out_f, stderr=err_f, check=True)
-
-    rows = []
-    for R, theta, element, _ in product(
-        radii_angstrom, contact_angles, nanoparticles, supports
-    ):
-        rows.append(
-            {
-                "r (A)": "",
-                "R (A)": R,
-                "Theta": theta,
-                "Element": element.capitalize(),
-                "Interface Facet": "(1,0,0)",
-                "Surface Facet": "",  # "(1,1,1)",
-            }
+        with contextlib.redirect_stdout(out_f), contextlib.redirect_stderr(err_f):
+            discrimination.main(argv)
+
+    # materialize the whole parameter grid from meshgrid columns and
+    # stream it through csv.writer directly: this was the script's only
+    # pandas use, and a DataFrame bought nothing for a write-once table
+    # (byte-identical output to the old to_csv, \n terminator included).
+    # ij indexing raveled matches the trajectory's frame order
+    R_grid, T_grid, E_grid, _ = np.meshgrid(
+        radii_angstrom, contact_angles, nanoparticles, supports, indexing="ij"
+    )
+    with open(input_to_atomcounter, "w", newline="") as f:
+        writer = csv.writer(f, lineterminator="\n")
+        writer.writerow(
+            ["r (A)", "R (A)", "Theta", "Element", "Interface Facet", "Surface Facet"]
+        )
+        writer.writerows(
+            ("", float(R), float(theta), str(element).capitalize(), "(1,0,0)", "")
+            for R, theta, element in zip(R_grid.ravel(), T_grid.ravel(), E_grid.ravel())
         )
-
-    df = pd.DataFrame(rows)
-    df.to_csv(input_to_atomcounter, index=False)
     print("Finished the atomistic modelling")
 
 
@@ -225,17 +283,17 @@ def run_atomcounter(input_file: str, output_file: str, output_dir: str) -> float
     atomcounter_out = output_dir + "atomcounter.out"
     atomcounter_err = output_dir + "atomcounter.err"
 
-    command = shlex.split(f"nanoparticle-atom-count -i {input_file} -o {output_file}")
+    # run the counter's main() in-process (it's the same function the
+    # nanoparticle-atom-count console script wraps) and time the call
+    # with perf_counter directly, rather than paying a subprocess's
+    # interpreter startup and scraping its "Calculation took" line;
+    # both streams go straight to the log files, so nothing is
+    # buffered in memory the way capture_output=True would
     with open(atomcounter_out, "w") as out_f, open(atomcounter_err, "w") as err_f:
-        subprocess.run(command, stdout=out_f, stderr=err_f, check=True)
-
-    timing = None
-    with open(atomcounter_out, "r") as t:
-        lines = t.readlines()
-        last = lines[-1].strip()
-        if last.startswith("Calculation took"):
-            parts = last.split()
-            timing = float(parts[2])
+        with contextlib.redirect_stdout(out_f), contextlib.redirect_stderr(err_f):
+            start = perf_counter()
+            atom_count_main(["-i", input_file, "-o", output_file])
+            timing = perf_counter() - start
 
     print("Finished running the nanoparticle atom counter")
 
@@ -254,16 +312,20 @@ def plot_parities(
         input_file:             name of input file to both
     """
     print("comparing . . .")
-    command = shlex.split(
-        f"python {script_dir}/plot-parity.py {atomistic_output} "
-        f"{atomcounter_output} {input_file} --output_dir {output_dir}"
-    )
+    argv = [
+        atomistic_output,
+        atomcounter_output,
+        input_file,
+        "--output_dir",
+        output_dir,
+    ]
 
     parity_out = output_dir + "parity.out"
     parity_err = output_dir + "parity.err"
 
     with open(parity_out, "w") as out_f, open(parity_err, "w") as err_f:
-        subprocess.run(command, stdout=out_f, stderr=err_f, check=True)
+        with contextlib.redirect_stdout(out_f), contextlib.redirect_stderr(err_f):
+            plot_parity.main(argv)
 
 
 ##ikimashou
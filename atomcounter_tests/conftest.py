@@ -0,0 +1,31 @@
+"""
+Shared fixtures for the test suite
+
+The reference systems are session-scoped, so each one is computed once
+even though the per-region value tests are parametrized into several
+nodes each
+"""
+
+import pytest
+from NanoparticleAtomCounter.by_area import calculate_areas, calculate_by_area
+from NanoparticleAtomCounter.by_volume import calculate_volumes, calculate_by_volume
+
+
+@pytest.fixture(scope="session")
+def cr_areas():
+    return calculate_areas("Cr", 55, 90, None, (1, 1, 1))
+
+
+@pytest.fixture(scope="session")
+def ag_area_atoms():
+    return calculate_by_area("Ag", 50, 90, (1, 0, 0), (1, 1, 1))
+
+
+@pytest.fixture(scope="session")
+def fe_volumes():
+    return calculate_volumes("Fe", 66, 90, (1, 1, 1))
+
+
+@pytest.fixture(scope="session")
+def ni_volume_atoms():
+    return calculate_by_volume("Ni", 150, 90, None, None)
@@ -7,6 +7,7 @@ import numpy as np
 import warnings
 from NanoparticleAtomCounter.by_area import (
     calculate_by_area,
+    calculate_by_area_batch,
     calculate_areas,
 )
 
@@ -26,25 +27,87 @@ def test_calculate_areas():
         calculate_areas("Co", 0.0, 155, (1, 0, 0))
     with pytest.warns(UserWarning):
         calculate_areas("Cu", 1.2, 67, (1, 0, 0))
-    ##test valid values
-    interface_A, peri_A, surf_A = calculate_areas("Cr", 55, 90, None, (1, 1, 1))
-    expected = [8567, 936, 18328]
-    for index, region_area in enumerate([interface_A, peri_A, surf_A]):
-        assert region_area == pytest.approx(expected[index], abs=2)
+    ##a negative first Miller index must not be mistaken for the
+    # NO_FACET "not given" sentinel: unsupported facets fail loudly
+    # instead of silently counting with the element's default facet
+    with pytest.raises(KeyError):
+        calculate_areas("Ag", 50, 90, (-1, 1, 1), None)
+
+
+##test valid values; each region is its own test node (rather than one
+# vectorized assert_allclose over all regions), so a failure names the
+# region and -x/xdist work per case
+@pytest.mark.parametrize(
+    "position, expected",
+    [(0, 8567), (1, 936), (2, 18328)],
+    ids=["interface", "perimeter", "surface"],
+)
+def test_calculate_areas_values(cr_areas, position, expected):
+    assert cr_areas[position] == pytest.approx(expected, abs=2)
 
 
-def test_calculate_by_area():
+##test valid values, using a hemispherical cap,
+# whose equations are simpler to calculate by hand
+@pytest.mark.parametrize(
+    "position, expected",
+    [(0, 106), (1, 833), (2, 2083), (3, 15306)],
+    ids=["perimeter", "interface", "surface", "total"],
+)
+def test_calculate_by_area(ag_area_atoms, position, expected):
     """
     No need, here, to test theta since a downstream function does so;
     Also no need to test element for the same reason
     """
-    ##test valid values, using a hemispherical cap,
-    # whose equations are simpler to calculate by hand
-    peri_atoms, interface_atoms, surf_atoms, total_atoms = calculate_by_area(
-        "Ag", 50, 90, (1, 0, 0), (1, 1, 1)
+    assert ag_area_atoms[position] == pytest.approx(expected, abs=2)
+
+
+##calculate_areas broadcasts over array radii/thetas (the batch path
+# relies on this); one swept call must equal the per-geometry scalar
+# calls
+def test_calculate_areas_vectorized():
+    radii = np.array([50.0, 55.0, 60.0])
+    thetas = np.array([70.0, 90.0, 135.0])
+    swept = calculate_areas("Cr", radii, thetas, (1, 0, 0), (1, 1, 1))
+    for row in range(len(radii)):
+        scalar = calculate_areas("Cr", radii[row], thetas[row], (1, 0, 0), (1, 1, 1))
+        for swept_region, scalar_region in zip(swept, scalar):
+            assert swept_region[row] == pytest.approx(scalar_region)
+
+
+##the batch entry point only regroups the rows by (element, facets);
+# it must reproduce the row-by-row scalar calls exactly
+def test_calculate_by_area_batch():
+    elements = np.array(["Ag", "Pd", "Ag"])
+    rs = np.array([50.0, 66.0, 120.0])
+    thetas = np.array([90.0, 70.0, 135.0])
+    interface_facets = np.array([(1, 0, 0), (1, 1, 1), (1, 0, 0)], dtype=np.int32)
+    surface_facets = np.array([(1, 1, 1), (1, 0, 0), (1, 1, 1)], dtype=np.int32)
+
+    batched = calculate_by_area_batch(
+        elements, rs, thetas, interface_facets, surface_facets
     )
-    expected = [106, 833, 2083, 15306]
-    for index, region_atoms in enumerate(
-        [peri_atoms, interface_atoms, surf_atoms, total_atoms]
-    ):
-        assert region_atoms == pytest.approx(expected[index], abs=2)
+
+    for row in range(len(elements)):
+        scalar = calculate_by_area(
+            elements[row],
+            rs[row],
+            thetas[row],
+            tuple(interface_facets[row]),
+            tuple(surface_facets[row]),
+        )
+        for batched_column, scalar_value in zip(batched, scalar):
+            assert batched_column[row] == scalar_value
+
+
+##same sentinel guarantee through the batch path: a (-1, 1, 1) row must
+# reach the constants lookup (and raise there), not be treated as
+# "facet not given"
+def test_calculate_by_area_batch_negative_facet():
+    with pytest.raises(KeyError):
+        calculate_by_area_batch(
+            np.array(["Ag"]),
+            np.array([50.0]),
+            np.array([90.0]),
+            np.array([(-1, 1, 1)], dtype=np.int32),
+            np.array([(1, 1, 1)], dtype=np.int32),
+        )
@@ -36,18 +36,24 @@ def test_alpha():
     assert alpha(90) == pytest.approx(1.0, abs=TOLERANCE)
 
 
+@pytest.mark.parametrize("angle", [0, 180])
+def test_beta_bad_angle(angle):
+    with pytest.raises(ValueError):
+        beta(angle)
+
+
 def test_beta():
-    for angle in [0, 180]:
-        with pytest.raises(ValueError):
-            beta(angle)
     assert beta(90) == pytest.approx(2.0, abs=TOLERANCE)
 
 
+##test angles
+@pytest.mark.parametrize("angle", [0, 180, -20, 200])
+def test_calculate_surface_area_bad_angle(angle):
+    with pytest.raises(ValueError):
+        calculate_surface_area("Pt", 3.2, angle, (1, 0, 0))
+
+
 def test_calculate_surface_area():
-    ##test angles
-    for angle in [0, 180, -20, 200]:
-        with pytest.raises(ValueError):
-            calculate_surface_area("Pt", 3.2, angle, (1, 0, 0))
     ##test invalid elements
     with pytest.raises(KeyError):
         calculate_surface_area("Px", 3.2, 33, (1, 0, 0))
@@ -61,6 +67,14 @@ def test_calculate_surface_area():
     ##test valid values
     area = calculate_surface_area("Pd", 70, 122, None)
     assert area > 0
+    ##parity with the arccos formulation it replaced, across theta
+    _, z, _ = calculate_constants("Pd", (1, 0, 0))
+    r = 70.0
+    thetas = np.linspace(1, 179, 90)
+    arg = np.clip(np.cos(np.radians(thetas)) + (z / r) * np.sin(np.radians(thetas)), -1, 1)
+    reference = 2 * np.pi * (r**2) * alpha(np.degrees(np.arccos(arg)))
+    fast = calculate_surface_area("Pd", np.full_like(thetas, r), thetas, (1, 0, 0))
+    assert fast == pytest.approx(reference, rel=1e-12)
 
 
 def test_calculate_total_volume():
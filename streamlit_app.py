@@ -3,22 +3,76 @@ This is the script the streamlit app uses
 https://nanoparticleatomcounter.streamlit.app/
 """
 import contextlib
-import os
-import tempfile
+import io
 from pathlib import Path
-import subprocess
-import sys
-import pandas as pd
+import pandas as pd  # already in sys.modules via streamlit, so free here
 import streamlit as st
-from NanoparticleAtomCounter.cli.atom_count import main as atom_counter
 
 
 st.set_page_config(page_title="Nanoparticle Atom Counter", page_icon="🧮")
 
+
+# streamlit reruns this whole script on every widget interaction;
+# cache the disk reads so reruns short-circuit the I/O
+@st.cache_data
+def _load_sample() -> bytes:
+    return Path("docs/sample_input.csv").read_bytes()
+
+
+@st.cache_data
+def _load_image(path: str) -> bytes:
+    # st.image accepts raw bytes, so the PNGs are read from disk once
+    # per process instead of once per rerun
+    return Path(path).read_bytes()
+
+
+@st.cache_data
+def _parse_upload(file_bytes: bytes, suffix: str) -> pd.DataFrame:
+    # keyed on the raw upload bytes, so re-running the same file (or
+    # clicking again after a widget change) skips the re-parse
+    buffer = io.BytesIO(file_bytes)
+    if suffix == ".csv":
+        # same dtype hints as the CLI reader: the numeric columns are
+        # converted while tokenizing, skipping the type-inference pass
+        # (spelled as strings so numpy stays un-imported until _count)
+        dtypes = {"r (A)": "float64", "R (A)": "float64", "Theta": "float64"}
+        try:
+            # same engine preference as the CLI reader: pyarrow ships
+            # with streamlit and parses columns natively
+            return pd.read_csv(buffer, engine="pyarrow", dtype=dtypes)
+        except ImportError:
+            buffer.seek(0)
+            return pd.read_csv(buffer, dtype=dtypes)
+    return pd.read_excel(buffer, sheet_name=0)
+
+
+@st.cache_data
+def _count(df: pd.DataFrame, mode: str) -> pd.DataFrame:
+    # the counter (and numpy behind it) only loads on the first actual
+    # run, not when a visitor merely opens the page; sys.modules makes
+    # every later call a dict hit
+    from NanoparticleAtomCounter.cli.atom_count import count_dataframe
+
+    # keyed on the parsed input and mode, so toggling widgets (or
+    # re-running the same upload) never recomputes
+    return count_dataframe(df, mode=mode)
+
+
+@st.cache_data
+def _results_csv_bytes(df: pd.DataFrame) -> bytes:
+    # rebuilt only when the results change, not on every rerun; the
+    # bytes come straight from the frame — no output file on disk, so
+    # there is nothing to mmap and no page-cache copy to avoid
+    return df.to_csv(index=False).encode()
+
+
+# hoisted out of the sidebar block: the cached bytes are resolved once
+# up front rather than inside the layout code on each rerun
+SAMPLE_CSV = _load_sample()
+
 with st.sidebar:
     st.header("Resources")
 
-    SAMPLE_CSV = Path("docs/sample_input.csv").read_bytes()
     st.download_button(
         "Sample input (.csv)",
         SAMPLE_CSV,
@@ -26,10 +80,10 @@ with st.sidebar:
         mime="text/csv",
     )
 
-    st.image("docs/Acute_1.png", caption="θ < 90°", use_container_width=True)
-    st.image("docs/Obtuse_1.png", caption="θ > 90°", use_container_width=True)
+    st.image(_load_image("docs/Acute_1.png"), caption="θ < 90°", use_container_width=True)
+    st.image(_load_image("docs/Obtuse_1.png"), caption="θ > 90°", use_container_width=True)
     st.image(
-        "docs/Nanoparticle_Legend.png",
+        _load_image("docs/Nanoparticle_Legend.png"),
         caption="Definition of surface, interfacial, and perimeter atoms",
         use_container_width=True,
     )
@@ -39,79 +93,69 @@ st.title("Nanoparticle Atom Counter")
 
 st.markdown(
     """
-Upload a **.csv** containing the columns  
+Upload a **.csv** containing the columns<br>
 `r (A), R (A), Theta, Element, Interface Facet, Surface Facet`.
 
-*Supply either **r** or **R** (if both are present, **r** is used).  
+*Supply either **r** or **R** (if both are present, **r** is used).<br>
 Interface Facet and Surface Facet are optional; leave blank if unknown.*
 
-**Need a template or a visual guide?**  
+**Need a template or a visual guide?**<br>
 A sample input file and explanatory diagrams are in the sidebar.
 """,
     unsafe_allow_html=True,
 )
 
-mode = st.radio("**Select Counting Mode**", ("volume", "area"), horizontal=True)
+# widget interactions inside a fragment rerun only the fragment, so
+# toggling the mode, picking a file, or clicking Run no longer
+# re-executes the sidebar and header code above
+@st.fragment
+def _run_section() -> None:
+    mode = st.radio("**Select Counting Mode**", ("volume", "area"), horizontal=True)
+
+    file = st.file_uploader(
+        "Drag-and-drop or browse for your input file",
+        type=("csv", "xls", "xlsx"),
+        accept_multiple_files=False,
+    )
 
-file = st.file_uploader(
-    "Drag-and-drop or browse for your input file",
-    type=("csv", "xls", "xlsx"),
-    accept_multiple_files=False,
-)
+    if file is None:
+        return  # wait for the user's input
 
-if file is None:
-    st.stop()  # wait for the user's input
+    if not st.button("⚙️ Run calculation"):
+        return
 
-if st.button("⚙️ Run calculation"):
     with st.spinner("Processing . . . "):
 
-        # temp input file
-        in_suffix = Path(file.name).suffix
-        with tempfile.NamedTemporaryFile(delete=False, suffix=in_suffix) as tempin:
-            tempin.write(file.getbuffer())
-            tempin.flush()
-            in_path = tempin.name
+        # both input and output stay in memory: the upload parses straight
+        # from streamlit's buffer and count_dataframe hands the results
+        # back as a frame, with no temp files (spooled or otherwise) or
+        # disk round-trip at all.
+        # uploads are capped by streamlit's own maxUploadSize (200 MB by
+        # default), so one pass over the already-buffered bytes is cheaper
+        # than streaming them to disk and reading them back.
+        # all rows are computed in grouped vectorized numpy calls
+        stderr_buffer = io.StringIO()
+        try:
+            df_in = _parse_upload(file.getvalue(), Path(file.name).suffix.lower())
+            with contextlib.redirect_stderr(stderr_buffer):
+                df_out = _count(df_in, mode)
+
+        except Exception as err:
+            st.error(f"Atom-counter failed:\n{stderr_buffer.getvalue() or err}")
+            return
+
+    # rendering happens after the spinner: only the parse + count are
+    # "processing", and there is no resource here needing cleanup on
+    # failure (everything above is in-memory, nothing touches /tmp)
+    st.markdown("#### Results")
+    st.download_button(
+        "Download CSV",
+        # the download stays CSV; convert from the frame on demand
+        data=_results_csv_bytes(df_out),
+        file_name="atom_count_output.csv",
+        mime="text/csv",
+    )
+    st.dataframe(df_out, use_container_width=True)
 
-        # temp output file
-        with tempfile.NamedTemporaryFile(delete=False, suffix=".csv") as tempout:
-            out_path = tempout.name
 
-        try:
-            # run the calculation
-            subprocess.run(
-                [
-                    sys.executable,
-                    "-m",
-                    "NanoparticleAtomCounter.cli.atom_count",
-                    "--input",
-                    in_path,
-                    "--output",
-                    out_path,
-                    "--mode",
-                    mode,
-                ],
-                check=True,
-                capture_output=True,
-                text=True,
-            )
-
-        except subprocess.CalledProcessError as err:
-            st.error(f"Atom-counter failed:\n{err.stderr}")
-            os.remove(in_path)
-            st.stop()
-
-        # now, read and show results
-        df_out = pd.read_csv(out_path)
-
-        st.markdown("#### Results")
-        st.download_button(
-            "Download CSV",
-            data=open(out_path, "rb").read(),
-            file_name="atom_count_output.csv",
-            mime="text/csv",
-        )
-        st.dataframe(df_out, use_container_width=True)
-
-        # cleanup
-        os.remove(in_path)
-        os.remove(out_path)
+_run_section()